@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Property, TenantUnit
+
+CACHE_KEY = 'access_scope:{user_id}'
+
+
+def _compute_property_ids(user):
+    role = user.role
+    if role == 'landlord':
+        return Property.objects.filter(owner_id=user.id).values_list('id', flat=True)
+    elif role == 'property_manager':
+        return Property.objects.filter(managers__user_id=user.id).values_list('id', flat=True)
+    elif role == 'caretaker':
+        return Property.objects.filter(caretakers__user_id=user.id).values_list('id', flat=True)
+    elif role == 'tenant':
+        return TenantUnit.objects.filter(tenant__user_id=user.id).values_list('unit__property_id', flat=True)
+    return []
+
+
+def get_accessible_property_ids(user):
+    """
+    Return the frozenset of property IDs ``user`` can see, or ``None`` for admins (no restriction).
+
+    The set is computed once and cached per user; the signals in
+    ``core_app.signals`` invalidate it when assignments or ownership change.
+    """
+    if user.role == 'admin':
+        return None
+    key = CACHE_KEY.format(user_id=user.id)
+    property_ids = cache.get(key)
+    if property_ids is None:
+        property_ids = sorted(set(_compute_property_ids(user)))
+        cache.set(key, property_ids, getattr(settings, 'ACCESS_SCOPE_CACHE_TIMEOUT', 300))
+    return frozenset(property_ids)
+
+
+def has_property_access(user, property_id):
+    property_ids = get_accessible_property_ids(user)
+    return property_ids is None or int(property_id) in property_ids
+
+
+def scope_queryset(queryset, user, field='property_id'):
+    """Restrict ``queryset`` to rows whose ``field`` is one of the user's accessible properties."""
+    property_ids = get_accessible_property_ids(user)
+    if property_ids is None:
+        return queryset
+    return queryset.filter(**{f'{field}__in': property_ids})
+
+
+def invalidate_access_scope(*user_ids):
+    cache.delete_many([CACHE_KEY.format(user_id=user_id) for user_id in user_ids if user_id is not None])
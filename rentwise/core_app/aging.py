@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.db.models import Count, DecimalField, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .ledger import ZERO
+
+AGING_GROUPS = {
+    'tenant': ['tenant_id', 'tenant__user__email', 'tenant__user__first_name', 'tenant__user__last_name'],
+    'property': ['property_id', 'property__name'],
+}
+BUCKETS = ['current', 'days_0_30', 'days_31_60', 'days_61_90', 'days_90_plus']
+UNPAID_STATUSES = ['pending', 'overdue']
+
+
+def _bucket_conditions(as_of):
+    # Bounds are due dates rather than computed ages, so the filters stay plain column comparisons
+    day = timedelta(days=1)
+    return {
+        'current': Q(due_date__gt=as_of) | Q(due_date__isnull=True),
+        'days_0_30': Q(due_date__lte=as_of, due_date__gte=as_of - 30 * day),
+        'days_31_60': Q(due_date__lt=as_of - 30 * day, due_date__gte=as_of - 60 * day),
+        'days_61_90': Q(due_date__lt=as_of - 60 * day, due_date__gte=as_of - 90 * day),
+        'days_90_plus': Q(due_date__lt=as_of - 90 * day),
+    }
+
+
+def _amount(condition=None):
+    return Coalesce(Sum('amount', filter=condition), ZERO, output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def _aggregates(as_of):
+    aggregates = {name: _amount(condition) for name, condition in _bucket_conditions(as_of).items()}
+    aggregates.update(total=_amount(), payment_count=Count('id'))
+    return aggregates
+
+
+def aging_report(payments, group_by, as_of):
+    """
+    Unpaid amounts of ``payments`` bucketed by days past due on ``as_of``, one row per tenant or property.
+
+    The buckets are conditional ``SUM`` aggregates of a single ``GROUP BY``
+    query, so no payment row is loaded into Python. ``current`` holds amounts
+    not yet due or without a due date. Returns a ``values()`` queryset with
+    the largest total first, and its field names in output order.
+    """
+    group_fields = AGING_GROUPS[group_by]
+    rows = (
+        payments.filter(status__in=UNPAID_STATUSES)
+        .order_by()
+        .values(*group_fields)
+        .annotate(**_aggregates(as_of))
+        .order_by('-total', group_fields[0])
+    )
+    return rows, group_fields + BUCKETS + ['total', 'payment_count']
+
+
+def aging_totals(payments, as_of):
+    """The same buckets over all unpaid ``payments``, as one aggregate row."""
+    return payments.filter(status__in=UNPAID_STATUSES).aggregate(**_aggregates(as_of))
@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.request import Request
+
+from .access import has_property_access
+from .authentication import StatelessJWTAuthentication
+from .overview import current_user_data, current_user_parts, property_overview_parts
+from .renderers import FastJSONRenderer
+
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ASYNC_QUERY_WORKERS', 32), thread_name_prefix='async-query',
+        )
+    return _executor
+
+
+def _in_worker(call):
+    # Worker threads keep their own connection; treat each call like a request so
+    # CONN_MAX_AGE and broken connections are honoured there too
+    def run():
+        close_old_connections()
+        try:
+            return call()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def fan_out(calls):
+    """
+    Run independent sync ORM callables at the same time and return their results in order.
+
+    Django's async ORM methods all funnel through one shared thread, so they
+    never overlap; ``thread_sensitive=False`` gives every call a thread of
+    the ``ASYNC_QUERY_WORKERS`` pool and a database connection of its own.
+    """
+    executor = _get_executor()
+    return await asyncio.gather(*(
+        sync_to_async(_in_worker(call), thread_sensitive=False, executor=executor)() for call in calls
+    ))
+
+
+def render(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def async_api_view(view):
+    """
+    Turn ``async def view(request, ...)`` into a GET-only Django async view
+    authenticated like the DRF views. ``request`` is a DRF ``Request``, so
+    serializers still see ``?fields=`` / ``?expand=``.
+    """
+    authenticator = StatelessJWTAuthentication()
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return render({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+        drf_request = Request(request, authenticators=[authenticator])
+        try:
+            user = await sync_to_async(lambda: drf_request.user)()
+            if not user.is_authenticated:
+                raise NotAuthenticated()
+        except APIException as exc:
+            # Same body as DRF's exception handler
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            response = render(data, status=exc.status_code)
+            if exc.status_code == 401:
+                response['WWW-Authenticate'] = authenticator.authenticate_header(drf_request)
+            return response
+        return await view(drf_request, *args, **kwargs)
+    return wrapper
+
+
+# ---------------------------
+# Current User
+# ---------------------------
+@async_api_view
+async def current_user(request):
+    """``/me/`` with the user row and role profile fetched concurrently."""
+    parts = current_user_parts(request.user)
+    return render(current_user_data(dict(zip(parts, await fan_out(parts.values())))))
+
+
+# ---------------------------
+# Property Overview
+# ---------------------------
+@async_api_view
+async def property_overview(request, property_id):
+    """Units, tenants, payment totals and open maintenance of a property, queried concurrently."""
+    user = request.user
+    if user.role not in ['landlord', 'property_manager']:
+        return render({"detail": "Forbidden"}, status=403)
+    if not await sync_to_async(has_property_access)(user, property_id):
+        return render({"detail": "Forbidden"}, status=403)
+
+    parts = property_overview_parts(property_id, request)
+    return render(dict(zip(parts, await fan_out(parts.values()))))
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# User fields written into the token by CustomTokenObtainPairSerializer.get_token
+CLAIM_FIELDS = ['email', 'role', 'first_name', 'last_name', 'is_staff']
+
+
+class VerifiedTokenCache:
+    """
+    Small thread-safe LRU of ``(user_id, token_version)`` pairs that were recently
+    confirmed against the database (user active, version current).
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_fresh(self, key):
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key):
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def forget_user(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+
+verified_tokens = VerifiedTokenCache(
+    max_size=getattr(settings, 'JWT_USER_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 30),
+)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds ``request.user`` from the token claims instead
+    of loading the User row on every request.
+
+    The user is a real ``User`` instance whose claim fields are populated and
+    whose remaining fields are deferred, so anything outside the claims is
+    loaded on first access. Each ``(user_id, token_version)`` pair is checked
+    against the database at most once per ``JWT_USER_CACHE_TTL`` seconds per
+    process; bumping ``User.token_version`` (done automatically on role,
+    staff, active or password changes) rejects older tokens within that window.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        # Tokens issued before the custom claims existed fall back to a lookup
+        if any(claim not in validated_token for claim in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+
+        token_version = validated_token.get('token_version', 0)
+        key = (user_id, token_version)
+        if not verified_tokens.is_fresh(key):
+            current = User.objects.filter(pk=user_id, token_version=token_version, is_active=True).exists()
+            if not current:
+                raise AuthenticationFailed("Token is no longer valid", code="token_not_valid")
+            verified_tokens.add(key)
+
+        data = {claim: validated_token[claim] for claim in CLAIM_FIELDS}
+        data.update(id=user_id, is_active=True, token_version=token_version)
+        # from_db expects values in model field order; missing fields are deferred
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in data]
+        return User.from_db(router.db_for_read(User), field_names, [data[name] for name in field_names])
@@ -0,0 +1,142 @@
+import calendar
+import logging
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .ledger import add_contribution, apply_deltas, empty_deltas, ledger_month, payment_contribution
+from .models import Payment, TenantUnit
+from .response_cache import bump_property_versions
+
+logger = logging.getLogger(__name__)
+
+
+def mark_overdue_payments(as_of=None, batch_size=1000):
+    """
+    Move ``pending`` payments whose ``due_date`` is before ``as_of`` (default today) to ``overdue``.
+
+    Works through the backlog in batches, each one a single set-based ``UPDATE``
+    in its own short transaction, so no lock is held for long. Returns
+    ``{"transitioned": rows, "elapsed": seconds}``.
+    """
+    as_of = as_of or timezone.localdate()
+    started = time.monotonic()
+    transitioned = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Payment.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', due_date__lt=as_of)
+                .order_by('id')
+                .values_list('id', 'property_id', 'due_date')[:batch_size]
+            )
+            if not batch:
+                break
+            updated = Payment.objects.filter(id__in=[row[0] for row in batch], status='pending').update(
+                status='overdue', updated_at=timezone.now()
+            )
+            # QuerySet.update() skips the Payment signals, so keep the ledger and cache versions in step here
+            deltas = empty_deltas()
+            for _, property_id, due_date in batch:
+                if property_id is not None:
+                    deltas[(property_id, ledger_month(due_date, None, None))]['overdue_count'] += 1
+            apply_deltas(deltas)
+            bump_property_versions(*{property_id for _, property_id, _ in batch})
+        transitioned += updated
+
+    elapsed = time.monotonic() - started
+    logger.info("Marked %d payments overdue in %.2fs", transitioned, elapsed)
+    return {"transitioned": transitioned, "elapsed": round(elapsed, 3)}
+
+
+def billing_period(day=None):
+    """First day of the month containing ``day`` (default today)."""
+    return (day or timezone.localdate()).replace(day=1)
+
+
+def invoiced_leases(period, tenant_ids=None):
+    """``(tenant_id, unit_id)`` pairs already invoiced for ``period``, optionally only for ``tenant_ids``."""
+    invoices = Payment.objects.filter(billing_period=period)
+    if tenant_ids is not None:
+        invoices = invoices.filter(tenant_id__in=tenant_ids)
+    return set(invoices.values_list('tenant_id', 'unit_id'))
+
+
+def insert_invoices(invoices, period):
+    """
+    Insert the ``invoices`` whose lease is not invoiced for ``period`` yet and
+    return the ones inserted.
+
+    An overlapping run can invoice one of the leases between the check and the
+    insert; the batch is then checked again and retried, so the result only
+    ever holds rows this run wrote.
+    """
+    seen = None
+    while True:
+        invoiced = invoiced_leases(period, {invoice.tenant_id for invoice in invoices})
+        new = [invoice for invoice in invoices if (invoice.tenant_id, invoice.unit_id) not in invoiced]
+        try:
+            with transaction.atomic():
+                Payment.objects.bulk_create(new)
+            return new
+        except IntegrityError:
+            # No other run invoiced one of these leases, so the conflict is something else
+            if invoiced == seen:
+                raise
+            seen = invoiced
+
+
+def generate_invoices(period=None, due_day=1, batch_size=5000):
+    """
+    Create the pending rent ``Payment`` for every lease active during the month starting ``period``.
+
+    A lease is active when it moved in on or before the last day of the month
+    and has not moved out before the first. Leases are read as flat rows in one
+    streamed query, leases already invoiced for the period are skipped, and the
+    rest are inserted with ``insert_invoices``; the unique constraint on
+    ``(tenant, unit, billing_period)`` makes re-runs and overlapping runs safe.
+    Returns ``{"created": rows, "skipped": rows, "elapsed": seconds}``.
+    """
+    period = billing_period(period)
+    last_day = period.replace(day=calendar.monthrange(period.year, period.month)[1])
+    due_date = min(period + timedelta(days=due_day - 1), last_day)
+    started = time.monotonic()
+
+    leases = TenantUnit.objects.filter(
+        Q(move_in_date__isnull=True) | Q(move_in_date__lte=last_day),
+        Q(move_out_date__isnull=True) | Q(move_out_date__gte=period),
+        unit__rent__gt=0,
+    ).order_by('id').values_list('tenant_id', 'unit_id', 'unit__property_id', 'unit__rent')
+    invoiced = invoiced_leases(period)
+
+    created = skipped = 0
+    rows = leases.iterator(chunk_size=batch_size)
+    while batch := list(islice(rows, batch_size)):
+        invoices = []
+        for tenant_id, unit_id, property_id, rent in batch:
+            if (tenant_id, unit_id) in invoiced:
+                skipped += 1
+                continue
+            invoices.append(Payment(
+                tenant_id=tenant_id, unit_id=unit_id, property_id=property_id, amount=rent,
+                due_date=due_date, billing_period=period, status='pending',
+            ))
+
+        # bulk_create skips the Payment signals, so update the ledger and cache versions here
+        with transaction.atomic():
+            new = insert_invoices(invoices, period)
+            deltas = empty_deltas()
+            for invoice in new:
+                add_contribution(deltas, payment_contribution(invoice))
+            apply_deltas(deltas)
+            bump_property_versions(*{invoice.property_id for invoice in new})
+        created += len(new)
+        skipped += len(invoices) - len(new)
+
+    elapsed = time.monotonic() - started
+    logger.info("Generated %d invoices for %s (%d already billed) in %.2fs", created, period, skipped, elapsed)
+    return {"created": created, "skipped": skipped, "elapsed": round(elapsed, 3)}
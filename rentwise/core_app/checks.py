@@ -0,0 +1,42 @@
+from importlib import import_module
+
+from django.core import checks
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+
+SEARCH_MIGRATION = ('core_app', '0011_search_index')
+
+
+def search_trigger_names():
+    """Names of the triggers that keep the SQLite FTS5 tables of ``0011_search_index`` in sync."""
+    tables = import_module('core_app.migrations.0011_search_index').SEARCH_TABLES
+    return {f'{table}_fts_{event}' for table in tables for event in ('insert', 'delete', 'update')}
+
+
+@checks.register(checks.Tags.database)
+def check_search_triggers(app_configs, databases=None, **kwargs):
+    """
+    SQLite drops a table's triggers when a migration rebuilds it, which most
+    AlterField operations do; the FTS5 index then silently stops following
+    the table. Runs with ``check --database`` and before ``migrate``.
+    """
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        if SEARCH_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            present = {name for name, in cursor.fetchall()}
+        missing = sorted(search_trigger_names() - present)
+        if missing:
+            errors.append(checks.Error(
+                f"Search index triggers are missing on database '{alias}': {', '.join(missing)}",
+                hint="A migration rebuilt the table; recreate the triggers with the statements of "
+                     "sqlite_statements() in core_app/migrations/0011_search_index.py, then "
+                     "\"INSERT INTO <table>_fts(<table>_fts) VALUES ('rebuild')\".",
+                id='core_app.E001',
+            ))
+    return errors
@@ -0,0 +1,114 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, IntegerField, Max, Value
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .response_cache import get_property_version, versions_are_shared
+from .routers import current_read_alias
+
+
+def queryset_validators(querysets):
+    """
+    Return ``(fingerprint, last_modified)`` from ``COUNT(*)`` and ``MAX(updated_at)`` of each queryset.
+
+    The aggregates of all the querysets are fetched together in one
+    ``UNION ALL`` query, one row per queryset.
+    """
+    stats = [
+        queryset.order_by().prefetch_related(None)
+        .values(position=Value(position, output_field=IntegerField()))
+        .annotate(count=Count('pk'), latest=Max('updated_at'))
+        .values_list('position', 'count', 'latest')
+        for position, queryset in enumerate(querysets)
+    ]
+    # Empty querysets (``none()``) are left out of the union and have no row
+    rows = {position: (count, latest) for position, count, latest in stats[0].union(*stats[1:], all=True)}
+
+    parts, last_modified = [], None
+    for position in range(len(stats)):
+        count, latest = rows.get(position, (0, None))
+        parts.append(f"{count}:{latest.isoformat() if latest else ''}")
+        if latest and (last_modified is None or latest > last_modified):
+            last_modified = latest
+    return '|'.join(parts), last_modified
+
+
+def property_validators(property_id):
+    """
+    Return ``(fingerprint, last_modified)`` of a per-property view from the
+    property's response-cache version: a cache read instead of a query. The
+    version moves on every write to the property's units, leases, payments
+    and maintenance requests, so it is only valid when that cache is shared
+    by every worker (see ``versions_are_shared``).
+    """
+    return f'v{get_property_version(property_id)}', None
+
+
+def conditional_response(request, querysets, respond, property_id=None):
+    """
+    Answer a GET with ``304 Not Modified`` when the client's ETag still matches ``querysets``.
+
+    The ETag hashes the row count and latest ``updated_at`` of every queryset
+    the response is built from, together with the user, the full path and the
+    ``Accept`` header. Per-property views also pass ``property_id``: reading
+    from the primary with a shared cache, the property version replaces the
+    aggregates. A replica may lag behind the version, and a process-local
+    cache (locmem) never sees the bumps of other workers, so in both cases the
+    aggregates stay. ``respond`` is only called
+    when the body is needed. Responses with ``?expand=`` embed rows these
+    validators do not cover and are always sent in full.
+    """
+    if request.method not in ('GET', 'HEAD') or 'expand' in request.query_params:
+        return respond()
+
+    if property_id is not None and versions_are_shared() and current_read_alias() == DEFAULT_DB_ALIAS:
+        fingerprint, last_modified = property_validators(property_id)
+    else:
+        fingerprint, last_modified = queryset_validators(querysets)
+    seed = '\n'.join([str(request.user.pk), request.get_full_path(), request.META.get('HTTP_ACCEPT', ''), fingerprint])
+    etag = f'W/"{hashlib.sha1(seed.encode()).hexdigest()}"'
+
+    # Only the ETag is compared: deleting a row lowers the count without moving
+    # MAX(updated_at), so If-Modified-Since alone could hide the change
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    response = respond()
+    if response.status_code == 200:
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalGetMixin:
+    """ViewSet mixin adding ETag / Last-Modified and ``304`` replies to ``list()`` and ``retrieve()``."""
+
+    def get_validator_querysets(self, queryset):
+        """Querysets whose rows make up the response; extend when the output includes related rows."""
+        return [queryset]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_response(
+            request, self.get_validator_querysets(queryset),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup: let retrieve() answer with its usual 404
+            return super().retrieve(request, *args, **kwargs)
+        return conditional_response(
+            request, self.get_validator_querysets(queryset),
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+from collections import Counter
+
+from django.db import connections
+
+_lock = threading.Lock()
+_opened = Counter()
+_requests = 0
+_started_at = time.time()
+
+
+def record_connection(alias):
+    with _lock:
+        _opened[alias] += 1
+
+
+def record_request():
+    global _requests
+    with _lock:
+        _requests += 1
+
+
+def connection_mode(settings_dict):
+    if settings_dict.get('OPTIONS', {}).get('pool'):
+        return 'pool'
+    max_age = settings_dict.get('CONN_MAX_AGE', 0)
+    return 'per-request' if max_age == 0 else 'persistent'
+
+
+def _server_connections(connection):
+    """Connections to this database by state, as PostgreSQL's ``pg_stat_activity`` sees them (all processes)."""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY 1"
+        )
+        return dict(cursor.fetchall())
+
+
+def connection_report():
+    """
+    Connection settings, pool utilization and connection churn for every configured database.
+
+    Pool statistics and the opened / requests counters belong to the process
+    answering; ``connections_per_request`` near 1 means every request opened
+    a new connection, near 0 that they are being reused.
+    """
+    with _lock:
+        opened, requests = dict(_opened), _requests
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        pool = getattr(connection, 'pool', None)
+        databases[alias] = {
+            'vendor': connection.vendor,
+            'mode': connection_mode(settings_dict),
+            'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+            'conn_health_checks': settings_dict.get('CONN_HEALTH_CHECKS'),
+            'pool': pool.get_stats() if pool is not None else None,
+            'connections_opened': opened.get(alias, 0),
+            'connections_per_request': round(opened.get(alias, 0) / requests, 3) if requests else None,
+            'server_connections': _server_connections(connection),
+        }
+    return {
+        'pid': os.getpid(),
+        'uptime': round(time.time() - _started_at, 1),
+        'requests': requests,
+        'databases': databases,
+    }
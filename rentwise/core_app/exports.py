@@ -0,0 +1,112 @@
+import csv
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Payment, MaintenanceRequest, TenantUnit
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+
+
+def _date_range_filter(field, start, end, is_datetime=False):
+    if is_datetime:
+        # Compare against aware datetimes so the column index stays usable
+        start = start and timezone.make_aware(datetime.combine(start, time.min))
+        end = end and timezone.make_aware(datetime.combine(end, time.max))
+    condition = Q()
+    if start:
+        condition &= Q(**{f'{field}__gte': start})
+    if end:
+        condition &= Q(**{f'{field}__lte': end})
+    return condition
+
+
+def export_payments(property_id, start, end):
+    return Payment.objects.filter(
+        _date_range_filter('due_date', start, end), property_id=property_id
+    ), ['id', 'tenant_id', 'unit_id', 'amount', 'due_date', 'payment_date', 'status', 'reference',
+        'created_at', 'updated_at']
+
+
+def export_maintenance(property_id, start, end):
+    return MaintenanceRequest.objects.filter(
+        _date_range_filter('request_date', start, end, is_datetime=True), property_id=property_id
+    ), ['id', 'tenant_id', 'unit_id', 'description', 'request_date', 'completion_date', 'status']
+
+
+def export_leases(property_id, start, end):
+    # Leases overlapping the range rather than starting inside it
+    condition = Q(unit__property_id=property_id)
+    if start:
+        condition &= Q(move_out_date__isnull=True) | Q(move_out_date__gte=start)
+    if end:
+        condition &= Q(move_in_date__isnull=True) | Q(move_in_date__lte=end)
+    return TenantUnit.objects.filter(condition).annotate(unit_number=F('unit__unit_number')), [
+        'id', 'tenant_id', 'unit_id', 'unit_number', 'move_in_date', 'move_out_date'
+    ]
+
+
+DATASETS = {
+    'payments': export_payments,
+    'maintenance': export_maintenance,
+    'leases': export_leases,
+}
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the value back, for use with ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(fields, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def _buffered(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_rows(rows, fields, file_format, filename):
+    """Stream an iterable of tuples matching ``fields`` as a CSV or NDJSON attachment."""
+    lines = _csv_lines(fields, rows) if file_format == 'csv' else _ndjson_lines(fields, rows)
+    response = StreamingHttpResponse(_buffered(lines), content_type=EXPORT_FORMATS[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
+
+
+def stream_export(queryset, fields, file_format, filename):
+    """
+    Stream ``fields`` of ``queryset`` as CSV or NDJSON.
+
+    Rows are fetched as flat tuples through ``iterator(chunk_size=...)`` and
+    written as they arrive, so time-to-first-byte and worker memory do not
+    depend on the size of the export.
+    """
+    rows = queryset.order_by('id').values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+    return stream_rows(rows, fields, file_format, filename)
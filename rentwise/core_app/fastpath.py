@@ -0,0 +1,150 @@
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose representation of a database value is the value itself
+_PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.ChoiceField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+# Fields that need model instances rather than a single column value
+_INSTANCE_FIELDS = (serializers.BaseSerializer, serializers.ManyRelatedField, serializers.SerializerMethodField)
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+    quantum = Decimal(1).scaleb(-field.decimal_places)
+    return lambda value: format(value.quantize(quantum, rounding=field.rounding), 'f')
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != 'iso-8601' or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _converter(field):
+    """Return a function from a database value to the field's output, or ``None`` when it is unchanged."""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if isinstance(field, _PASSTHROUGH_FIELDS):
+        return None
+    return field.to_representation
+
+
+class ValuesPlan:
+    """The ``values()`` columns a serializer reads and the converter for each output field."""
+
+    def __init__(self, columns, fields):
+        self.columns = columns
+        self.fields = fields
+
+    def render(self, rows):
+        fields = self.fields
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in fields:
+                value = row[column]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+def compile_values_plan(serializer):
+    """
+    Build a ``ValuesPlan`` reproducing ``serializer``'s output from ``values()`` rows.
+
+    Only serializers whose readable fields are all single model columns (or
+    foreign keys rendered as ids) qualify; anything nested, many-valued or
+    computed returns ``None`` and must go through the serializer itself.
+    """
+    model = serializer.Meta.model
+    columns, fields = [], []
+    for field in serializer._readable_fields:
+        if isinstance(field, _INSTANCE_FIELDS) or len(field.source_attrs) != 1:
+            return None
+        if isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        columns.append(model_field.attname)
+        fields.append((field.field_name, model_field.attname, _converter(field)))
+    return ValuesPlan(columns, fields)
+
+
+def serialize_rows(queryset, serializer_class, request):
+    """List data for ``queryset``, built from ``values()`` rows when the serializer allows it."""
+    serializer = serializer_class(context={'request': request})
+    plan = compile_values_plan(serializer)
+    if plan is None:
+        return serializer_class(queryset, many=True, context={'request': request}).data
+    return plan.render(queryset.values(*plan.columns))
+
+
+def serialize_page(queryset, serializer_class, request, paginator, view=None):
+    """
+    Paginated response for ``queryset``, with the page built from ``values()``
+    rows when the serializer allows it, like ``serialize_rows``.
+    """
+    serializer = serializer_class(context={'request': request})
+    plan = compile_values_plan(serializer)
+    if plan is None:
+        page = paginator.paginate_queryset(queryset, request, view=view)
+        return paginator.get_paginated_response(
+            serializer_class(page, many=True, context={'request': request}).data
+        )
+    # The keyset paginator reads its ordering columns from each row
+    keyset = [name for name, _ in paginator.get_keyset(request)]
+    page = paginator.paginate_queryset(queryset.values(*dict.fromkeys(plan.columns + keyset)), request, view=view)
+    return paginator.get_paginated_response(plan.render(page))
+
+
+class ValuesListMixin:
+    """
+    ViewSet mixin whose ``list()`` skips model instances and per-field
+    serialization, rendering each page straight from ``values()`` rows.
+    Falls back to the regular ``list()`` when the requested fields need
+    the serializer (e.g. ``?expand=``).
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = compile_values_plan(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        # The keyset paginator reads its ordering columns from each row
+        keyset = [name for name, _ in getattr(self.paginator, 'keyset', ())]
+        rows = self.filter_queryset(self.get_queryset()).values(*dict.fromkeys(plan.columns + keyset))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
@@ -0,0 +1,117 @@
+from rest_framework import serializers
+
+
+def parse_field_paths(value):
+    """Turn ``"a,b.c,b.d"`` into ``{"a": {}, "b": {"c": {}, "d": {}}}``; ``None`` when ``value`` is ``None``."""
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def requested_fieldsets(request):
+    """Return the ``(fields, expand)`` trees asked for in the request's ``?fields=`` / ``?expand=``."""
+    params = getattr(request, 'query_params', {})
+    return parse_field_paths(params.get('fields')) or None, parse_field_paths(params.get('expand')) or {}
+
+
+class Expandable:
+    """A relation rendered as its primary key(s) unless it is named in ``?expand=``."""
+
+    def __init__(self, serializer, many=False, source=None):
+        self.serializer = serializer
+        self.many = many
+        self.source = source
+
+
+class ExpandableFieldsMixin:
+    """
+    Sparse fieldsets and opt-in expansion for a ``ModelSerializer``.
+
+    Relations declared in ``Meta.expandable`` render as ids unless expanded;
+    ``fields`` leaves every field that was not asked for out of the output. Both take
+    dotted paths (``?expand=tenant.user&fields=id,amount,tenant.id``). The
+    top-level serializer reads them from the request in its context; nested
+    serializers receive their part of the trees from their parent.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if expand is None:
+            fields, expand = requested_fieldsets(self.context.get('request'))
+        self._only = fields
+        self._expand = expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name, relation in getattr(self.Meta, 'expandable', {}).items():
+            if name not in fields:
+                continue
+            if name in self._expand:
+                fields[name] = relation.serializer(
+                    many=relation.many, read_only=True, source=relation.source,
+                    fields=(self._only or {}).get(name) or None, expand=self._expand[name],
+                )
+            else:
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    many=relation.many, read_only=True, source=relation.source,
+                )
+        return fields
+
+    @property
+    def _readable_fields(self):
+        # Only trims the output; writable fields are still validated on input
+        for field in super()._readable_fields:
+            if not self._only or field.field_name in self._only:
+                yield field
+
+
+def _collect_plan(serializer_class, only, expand, prefix, select, prefetch, under_prefetch=False):
+    for name, relation in getattr(getattr(serializer_class, 'Meta', None), 'expandable', {}).items():
+        if only and name not in only:
+            continue
+        path = prefix + (relation.source or name)
+        if name in expand:
+            if relation.many or under_prefetch:
+                prefetch.append(path)
+            else:
+                select.append(path)
+            _collect_plan(
+                relation.serializer, (only or {}).get(name) or None, expand[name], path + '__',
+                select, prefetch, under_prefetch or relation.many,
+            )
+        elif relation.many:
+            # The ids of a to-many relation still need one query per page
+            prefetch.append(path)
+
+
+def apply_query_plan(queryset, serializer_class, request):
+    """
+    Add the ``select_related`` / ``prefetch_related`` calls ``serializer_class`` needs for this request.
+
+    Expanded to-one relations are joined, expanded or id-only to-many relations
+    are prefetched, and relations that are left out or rendered as a foreign
+    key id cost no extra query.
+    """
+    only, expand = requested_fieldsets(request)
+    select, prefetch = [], []
+    _collect_plan(serializer_class, only, expand, '', select, prefetch)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class ExpandableQuerysetMixin:
+    """ViewSet mixin that shapes ``get_queryset()`` to the fields and expansions in the request."""
+
+    def get_queryset(self):
+        return apply_query_plan(super().get_queryset(), self.get_serializer_class(), self.request)
@@ -0,0 +1,108 @@
+from django.db.models import Q
+from django_filters import rest_framework as filters
+from django_filters import utils
+
+from .models import Payment, MaintenanceRequest, Unit, TenantUnit
+
+
+def _is_set(value):
+    # Range fields clean an empty pair to slice(None, None)
+    if isinstance(value, slice):
+        return value.start is not None or value.stop is not None
+    return value not in (None, '', [])
+
+
+class IndexedFilterSet(filters.FilterSet):
+    """
+    FilterSet that only accepts filter combinations an index can serve.
+
+    ``index_leads`` names the filters on the leading column of an index.
+    Every other filter only narrows rows within such an index, so it is
+    rejected unless a lead is given too. Non-admin querysets are already
+    restricted to the caller's properties or tenancy, which counts as a lead.
+    """
+    index_leads = []
+
+    def is_scoped(self):
+        user = getattr(self.request, 'user', None)
+        return user is not None and user.is_authenticated and user.role != 'admin'
+
+    def is_valid(self):
+        if not super().is_valid():
+            return False
+        active = {name for name, value in self.form.cleaned_data.items() if _is_set(value)}
+        if active & set(self.index_leads) or self.is_scoped():
+            return True
+        leads = ', '.join(self.index_leads)
+        for name in active:
+            self.form.add_error(name, f"Only indexed together with one of: {leads}")
+        return not active
+
+
+class PaymentFilter(IndexedFilterSet):
+    status = filters.MultipleChoiceFilter(choices=Payment.STATUS_CHOICES)
+    due_date = filters.DateFromToRangeFilter()
+    property = filters.NumberFilter(field_name='property_id')
+    tenant = filters.NumberFilter(field_name='tenant_id')
+
+    # payment_status_due_date_idx, payment_due_date_id_idx, payment_property_due_idx, tenant_id
+    index_leads = ['status', 'due_date', 'property', 'tenant']
+
+    class Meta:
+        model = Payment
+        fields = ['status', 'due_date', 'property', 'tenant']
+
+
+class MaintenanceRequestFilter(IndexedFilterSet):
+    status = filters.MultipleChoiceFilter(choices=MaintenanceRequest._meta.get_field('status').choices)
+    request_date = filters.DateFromToRangeFilter()
+    property = filters.NumberFilter(field_name='property_id')
+
+    # maint_status_request_date_idx, maint_request_date_id_idx, maint_property_request_idx
+    index_leads = ['status', 'request_date', 'property']
+
+    class Meta:
+        model = MaintenanceRequest
+        fields = ['status', 'request_date', 'property']
+
+
+class UnitFilter(IndexedFilterSet):
+    status = filters.MultipleChoiceFilter(choices=Unit.STATUS_CHOICES)
+    rent = filters.RangeFilter()
+    property = filters.NumberFilter(field_name='property_id')
+
+    # unit_property_status_idx and unit_property_rent_idx both lead with the property
+    index_leads = ['property']
+
+    class Meta:
+        model = Unit
+        fields = ['status', 'rent', 'property']
+
+
+class TenantUnitFilter(IndexedFilterSet):
+    active_on = filters.DateFilter(method='filter_active_on')
+    unit = filters.NumberFilter(field_name='unit_id')
+    tenant = filters.NumberFilter(field_name='tenant_id')
+
+    # tenantunit_unit_move_out_idx and the tenant foreign key index
+    index_leads = ['unit', 'tenant']
+
+    class Meta:
+        model = TenantUnit
+        fields = ['active_on', 'unit', 'tenant']
+
+    @staticmethod
+    def filter_active_on(queryset, name, value):
+        """Leases covering ``value``; an empty move-in / move-out date leaves that side open."""
+        return queryset.filter(
+            Q(move_in_date__isnull=True) | Q(move_in_date__lte=value),
+            Q(move_out_date__isnull=True) | Q(move_out_date__gte=value),
+        )
+
+
+def apply_filters(filterset_class, queryset, request):
+    """Filter ``queryset`` in an ``APIView`` the way ``DjangoFilterBackend`` does for a viewset."""
+    filterset = filterset_class(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise utils.translate_validation(filterset.errors)
+    return filterset.qs
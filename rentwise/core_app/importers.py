@@ -0,0 +1,213 @@
+import codecs
+import csv
+import json
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .access import get_accessible_property_ids
+from .ledger import add_contribution, apply_deltas, empty_deltas, payment_contribution
+from .models import TenantProfile, TenantUnit, Payment
+from .response_cache import bump_property_versions
+
+STATEMENT_FORMATS = ['csv', 'jsonl']
+MAX_REPORTED_ERRORS = 100
+AMOUNT_FIELD = Payment._meta.get_field('amount')
+REFERENCE_LENGTH = Payment._meta.get_field('reference').max_length
+
+
+def normalize_phone(value):
+    return re.sub(r'\D', '', value or '')
+
+
+class StatementError(ValueError):
+    """The statement cannot be read any further (bad encoding or broken CSV)."""
+
+
+def read_statement(stream, file_format):
+    """
+    Yield row dicts from a binary CSV or JSON-lines statement, one line at a time.
+
+    Raises ``StatementError`` when a line cannot be decoded or parsed; the rows
+    yielded before it may already have been imported.
+    """
+    if file_format not in STATEMENT_FORMATS:
+        raise ValueError(f"Unsupported statement format: {file_format}")
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    try:
+        if file_format == 'csv':
+            yield from csv.DictReader(lines)
+        else:
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+    except UnicodeDecodeError as exc:
+        raise StatementError(f"The statement is not valid UTF-8 ({exc.reason} at byte {exc.start})") from exc
+    except csv.Error as exc:
+        raise StatementError(f"Malformed CSV: {exc}") from exc
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class PaymentImporter:
+    """
+    Stream statement rows into ``Payment`` records in fixed-size batches.
+
+    Each row needs a ``reference``, an ``amount`` and a payer identified by
+    ``tenant_id`` (TenantProfile id), ``phone`` or ``email``; ``date`` (ISO) is
+    the payment date and defaults to today. A payment goes to the payer's only
+    current lease and stays unattributed when they have none or several, like
+    rows saved through the models. Payers are matched through lookup
+    dicts built once up front, so memory grows with the number of tenants and
+    the batch size, never with the file. Duplicates are detected by reference
+    against the database, which already holds every earlier batch.
+    """
+
+    def __init__(self, user=None, batch_size=1000):
+        self.batch_size = batch_size
+        self.summary = {'accepted': 0, 'duplicate': 0, 'unmatched': 0, 'invalid': 0, 'errors': []}
+        self.build_lookups(user)
+
+    def build_lookups(self, user):
+        self.property_ids = get_accessible_property_ids(user) if user is not None else None
+        tenants = TenantProfile.objects.all()
+        if self.property_ids is not None:
+            tenants = tenants.filter(id__in=TenantUnit.objects.filter(
+                unit__property_id__in=self.property_ids,
+            ).values('tenant_id'))
+
+        # The same rule as fill_unit_and_property: the tenant's only current lease,
+        # wherever it is; tenants with several stay unattributed
+        self.placements = TenantUnit.objects.current().filter(tenant_id__in=tenants.values('id')).placements()
+
+        self.by_email, self.by_phone = {}, {}
+        for tenant_id, email, phone in tenants.values_list('id', 'user__email', 'user__phone_number').iterator():
+            self.by_email[email.lower()] = tenant_id
+            self.by_phone[normalize_phone(phone)] = tenant_id
+        self.tenant_ids = set(self.by_email.values())
+
+    def match_tenant(self, row):
+        tenant_id = row.get('tenant_id')
+        if tenant_id not in (None, ''):
+            try:
+                tenant_id = int(tenant_id)
+            except (TypeError, ValueError):
+                return None
+            return tenant_id if tenant_id in self.tenant_ids else None
+        if row.get('phone'):
+            return self.by_phone.get(normalize_phone(str(row['phone'])))
+        if row.get('email'):
+            return self.by_email.get(str(row['email']).strip().lower())
+        return None
+
+    def record_error(self, kind, row_number, message):
+        self.summary[kind] += 1
+        if len(self.summary['errors']) < MAX_REPORTED_ERRORS:
+            self.summary['errors'].append({'row': row_number, 'error': message})
+
+    def build_payment(self, row_number, row):
+        if not isinstance(row, dict):
+            self.record_error('invalid', row_number, "Malformed row")
+            return None
+        reference = str(row.get('reference') or '').strip()
+        if not reference:
+            self.record_error('invalid', row_number, "Missing reference")
+            return None
+        if len(reference) > REFERENCE_LENGTH:
+            self.record_error('invalid', row_number, f"Reference longer than {REFERENCE_LENGTH} characters")
+            return None
+        try:
+            amount = Decimal(str(row.get('amount')).replace(',', ''))
+            payment_date = date.fromisoformat(row['date']) if row.get('date') else timezone.localdate()
+        except (InvalidOperation, TypeError, ValueError):
+            self.record_error('invalid', row_number, "Invalid amount or date")
+            return None
+        try:
+            # Rejects NaN / infinity and amounts that do not fit the column
+            AMOUNT_FIELD.run_validators(amount)
+        except ValidationError as exc:
+            self.record_error('invalid', row_number, f"Invalid amount: {' '.join(exc.messages)}")
+            return None
+        if amount <= 0:
+            self.record_error('invalid', row_number, "Amount must be positive")
+            return None
+
+        tenant_id = self.match_tenant(row)
+        if tenant_id is None:
+            self.record_error('unmatched', row_number, f"No tenant matches reference {reference}")
+            return None
+        unit_id, property_id = self.placements.get(tenant_id, (None, None))
+        if property_id is not None and self.property_ids is not None and property_id not in self.property_ids:
+            self.record_error('unmatched', row_number, f"The tenant of reference {reference} now leases elsewhere")
+            return None
+        return Payment(
+            tenant_id=tenant_id, unit_id=unit_id, property_id=property_id,
+            amount=amount, payment_date=payment_date, status='paid', reference=reference,
+        )
+
+    def import_batch(self, batch):
+        payments = {}
+        for row_number, row in batch:
+            payment = self.build_payment(row_number, row)
+            if payment is None:
+                continue
+            if payment.reference in payments:
+                self.summary['duplicate'] += 1
+                continue
+            payments[payment.reference] = payment
+
+        # bulk_create skips the Payment signals, so update the ledger and cache versions here
+        with transaction.atomic():
+            new = self.insert_new(payments)
+            deltas = empty_deltas()
+            for payment in new:
+                add_contribution(deltas, payment_contribution(payment))
+            apply_deltas(deltas)
+            bump_property_versions(*{payment.property_id for payment in new})
+        self.summary['duplicate'] += len(payments) - len(new)
+        self.summary['accepted'] += len(new)
+
+    def existing_references(self, references):
+        return set(Payment.objects.filter(reference__in=references).values_list('reference', flat=True))
+
+    def insert_new(self, payments):
+        """
+        Insert the ``{reference: payment}`` rows whose reference is not in the
+        database yet and return the ones inserted.
+
+        A concurrent import can insert one of the references between the check
+        and the insert; the batch is then checked again and retried, so the
+        result only ever holds rows this import wrote.
+        """
+        seen = None
+        while True:
+            existing = self.existing_references(payments.keys())
+            new = [payment for reference, payment in payments.items() if reference not in existing]
+            try:
+                with transaction.atomic():
+                    Payment.objects.bulk_create(new)
+                return new
+            except IntegrityError:
+                # No new duplicate reference appeared, so the conflict is something else
+                if existing == seen:
+                    raise
+                seen = existing
+
+    def run(self, rows):
+        """Import an iterable of row dicts and return the summary."""
+        for batch in chunked(enumerate(rows, start=1), self.batch_size):
+            self.import_batch(batch)
+        return self.summary
@@ -0,0 +1,146 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from rest_framework import serializers
+
+from .access import get_accessible_property_ids, invalidate_access_scope
+from .ledger import add_contribution, apply_deltas, empty_deltas, payment_contribution
+from .models import User, Unit, TenantProfile, TenantUnit, Payment, MaintenanceRequest
+from .response_cache import bump_property_versions
+
+
+class LeaseAssignmentSerializer(serializers.Serializer):
+    tenant_id = serializers.IntegerField()
+    unit_id = serializers.IntegerField()
+    move_in_date = serializers.DateField(required=False, allow_null=True)
+    move_out_date = serializers.DateField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        move_in, move_out = attrs.get('move_in_date'), attrs.get('move_out_date')
+        if move_in and move_out and move_out < move_in:
+            raise serializers.ValidationError("move_out_date must not be before move_in_date")
+        return attrs
+
+
+def assign_units_bulk(user, rows):
+    """
+    Create a ``TenantUnit`` lease for every valid ``(tenant_id, unit_id, move_in_date, move_out_date)`` row.
+
+    Tenants, units, profiles and existing leases are resolved with a handful of
+    set-based queries and the new leases are inserted with one ``bulk_create``.
+    ``tenant_id`` is the tenant's user id, as in ``AssignUnitToTenantView``.
+    Returns ``(created_count, errors)`` where ``errors`` is a list of
+    ``{"row": index, "errors": ...}`` for the rows that were skipped.
+    """
+    errors = []
+    valid = []
+    for index, row in enumerate(rows):
+        serializer = LeaseAssignmentSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({"row": index, "errors": serializer.errors})
+
+    tenant_user_ids = {row['tenant_id'] for _, row in valid}
+    unit_ids = {row['unit_id'] for _, row in valid}
+    tenant_users = set(User.objects.filter(id__in=tenant_user_ids, role='tenant').values_list('id', flat=True))
+    unit_properties = dict(Unit.objects.filter(id__in=unit_ids).values_list('id', 'property_id'))
+    accessible = get_accessible_property_ids(user)
+
+    accepted = []
+    for index, row in valid:
+        property_id = unit_properties.get(row['unit_id'])
+        if row['tenant_id'] not in tenant_users:
+            errors.append({"row": index, "errors": {"tenant_id": ["Tenant not found"]}})
+        elif property_id is None:
+            errors.append({"row": index, "errors": {"unit_id": ["Unit not found"]}})
+        elif accessible is not None and property_id not in accessible:
+            errors.append({"row": index, "errors": {"unit_id": ["You do not manage this property"]}})
+        else:
+            accepted.append((index, row))
+
+    with transaction.atomic():
+        # Create the missing tenant profiles in one go, then map user id -> profile id
+        needed = {row['tenant_id'] for _, row in accepted}
+        profiles = dict(TenantProfile.objects.filter(user_id__in=needed).values_list('user_id', 'id'))
+        TenantProfile.objects.bulk_create(
+            [TenantProfile(user_id=user_id) for user_id in needed - profiles.keys()],
+            batch_size=1000,
+        )
+        if needed - profiles.keys():
+            profiles = dict(TenantProfile.objects.filter(user_id__in=needed).values_list('user_id', 'id'))
+
+        existing = set(
+            TenantUnit.objects.filter(
+                tenant_id__in=profiles.values(), unit_id__in={row['unit_id'] for _, row in accepted}
+            ).values_list('tenant_id', 'unit_id')
+        )
+        leases = []
+        for index, row in accepted:
+            key = (profiles[row['tenant_id']], row['unit_id'])
+            if key in existing:
+                errors.append({"row": index, "errors": {"non_field_errors": ["Unit already assigned to tenant"]}})
+                continue
+            existing.add(key)
+            leases.append(TenantUnit(
+                tenant_id=key[0],
+                unit_id=key[1],
+                move_in_date=row.get('move_in_date'),
+                move_out_date=row.get('move_out_date'),
+            ))
+        TenantUnit.objects.bulk_create(leases, batch_size=1000)
+
+    # bulk_create skips the post_save signals that keep tenants' scopes and cached responses fresh
+    invalidate_access_scope(*needed)
+    bump_property_versions(*TenantUnit.objects.filter(
+        tenant_id__in={lease.tenant_id for lease in leases}
+    ).values_list('unit__property_id', flat=True).distinct())
+    attribute_unplaced_rows({lease.tenant_id for lease in leases})
+    errors.sort(key=lambda error: error["row"])
+    return len(leases), errors
+
+
+def attribute_unplaced_rows(tenant_ids):
+    """
+    Attach the payments and maintenance requests of ``tenant_ids`` that have no
+    unit to the tenant's lease, for tenants with exactly one current lease.
+
+    Rows recorded before a tenant's first lease, or while they held several,
+    have no property and are invisible to the property-scoped views and the
+    ledger until then. Call after creating leases.
+
+    The placements come from one grouped query and each table is changed with
+    one ``UPDATE`` joined back to the tenant's current lease, so the number of
+    queries does not grow with the number of tenants.
+    """
+    leases = TenantUnit.objects.current()
+    placements = leases.filter(tenant_id__in=tenant_ids).placements()
+    if not placements:
+        return
+    placed_lease = leases.filter(tenant_id=OuterRef('tenant_id'))
+    placement = {
+        'unit_id': Subquery(placed_lease.values('unit_id')[:1]),
+        'property_id': Subquery(placed_lease.values('unit__property_id')[:1]),
+    }
+
+    deltas = empty_deltas()
+    with transaction.atomic():
+        payments = list(
+            Payment.objects.select_for_update()
+            .filter(tenant_id__in=list(placements), unit__isnull=True, property__isnull=True)
+            .only('tenant_id', 'amount', 'status', 'due_date', 'payment_date', 'created_at')
+        )
+        for payment in payments:
+            payment.unit_id, payment.property_id = placements[payment.tenant_id]
+            add_contribution(deltas, payment_contribution(payment))
+        updated = len(payments)
+        if payments:
+            Payment.objects.filter(pk__in=[payment.pk for payment in payments]).update(
+                updated_at=timezone.now(), **placement
+            )
+        updated += MaintenanceRequest.objects.filter(
+            tenant_id__in=list(placements), unit__isnull=True, property__isnull=True
+        ).update(**placement)
+        apply_deltas(deltas)
+    if updated:
+        bump_property_versions(*{property_id for _, property_id in placements.values()})
@@ -0,0 +1,121 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncMonth
+from django.utils import timezone
+
+from .models import Payment, PropertyLedger
+
+LEDGER_FIELDS = ('billed', 'collected', 'outstanding', 'overdue_count')
+ZERO = Decimal('0.00')
+
+
+def ledger_month(due_date, payment_date, created_at):
+    """First day of the month a payment is booked in: due date, else payment date, else creation date."""
+    day = due_date or payment_date or timezone.localdate(created_at or timezone.now())
+    return day.replace(day=1)
+
+
+def payment_contribution(payment):
+    """Return ``((property_id, month), amounts)`` for a payment, or ``None`` if it has no property."""
+    if payment.property_id is None:
+        return None
+    paid = payment.status == 'paid'
+    amount = Decimal(payment.amount)
+    return (payment.property_id, ledger_month(payment.due_date, payment.payment_date, payment.created_at)), {
+        'billed': amount,
+        'collected': amount if paid else ZERO,
+        'outstanding': ZERO if paid else amount,
+        'overdue_count': 1 if payment.status == 'overdue' else 0,
+    }
+
+
+def empty_deltas():
+    return defaultdict(lambda: dict.fromkeys(LEDGER_FIELDS, 0))
+
+
+def add_contribution(deltas, contribution, sign=1):
+    if contribution is None:
+        return
+    key, amounts = contribution
+    for field, value in amounts.items():
+        deltas[key][field] += sign * value
+
+
+def apply_deltas(deltas):
+    """
+    Add ``{(property_id, month): {field: delta}}`` to the ledger rows.
+
+    Each row is changed with an ``UPDATE ... SET x = x + delta`` so concurrent
+    writers never overwrite each other's totals. Signals cover single-row saves;
+    bulk writes (``bulk_create`` / ``QuerySet.update``) must call this themselves.
+    """
+    with transaction.atomic():
+        for (property_id, month), changes in deltas.items():
+            changes = {field: value for field, value in changes.items() if value}
+            if not changes:
+                continue
+            PropertyLedger.objects.get_or_create(property_id=property_id, month=month)
+            PropertyLedger.objects.filter(property_id=property_id, month=month).update(
+                updated_at=timezone.now(),
+                **{field: F(field) + value for field, value in changes.items()}
+            )
+
+
+# ---------------------------
+# Rebuild / verify
+# ---------------------------
+def compute_ledger():
+    """Aggregate the ledger straight from the Payment table, keyed by ``(property_id, month)``."""
+    rows = (
+        Payment.objects.exclude(property__isnull=True)
+        .annotate(month=TruncMonth(
+            Coalesce('due_date', 'payment_date', Cast('created_at', DateField())),
+            output_field=DateField(),
+        ))
+        .values('property_id', 'month')
+        .annotate(
+            billed=Coalesce(Sum('amount'), ZERO),
+            collected=Coalesce(Sum('amount', filter=Q(status='paid')), ZERO),
+            outstanding=Coalesce(Sum('amount', filter=~Q(status='paid')), ZERO),
+            overdue_count=Count('id', filter=Q(status='overdue')),
+        )
+        .order_by()
+    )
+    return {
+        (row['property_id'], row['month']): {field: row[field] for field in LEDGER_FIELDS}
+        for row in rows
+    }
+
+
+def rebuild_ledger():
+    """Replace every ledger row with freshly aggregated totals. Returns the number of rows written."""
+    with transaction.atomic():
+        expected = compute_ledger()
+        PropertyLedger.objects.all().delete()
+        PropertyLedger.objects.bulk_create(
+            [PropertyLedger(property_id=property_id, month=month, **amounts)
+             for (property_id, month), amounts in expected.items()],
+            batch_size=1000,
+        )
+    return len(expected)
+
+
+def verify_ledger():
+    """Return ``[(property_id, month, field, stored, expected)]`` for every ledger value that is off."""
+    expected = compute_ledger()
+    stored = {
+        (row['property_id'], row['month']): {field: row[field] for field in LEDGER_FIELDS}
+        for row in PropertyLedger.objects.values('property_id', 'month', *LEDGER_FIELDS)
+    }
+    empty = dict.fromkeys(LEDGER_FIELDS, 0)
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys()):
+        for field in LEDGER_FIELDS:
+            have = stored.get(key, empty)[field]
+            want = expected.get(key, empty)[field]
+            if have != want:
+                mismatches.append((*key, field, have, want))
+    return mismatches
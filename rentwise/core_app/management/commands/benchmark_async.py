@@ -0,0 +1,154 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from core_app.models import User, Property, Unit, TenantProfile, TenantUnit, Payment, MaintenanceRequest
+from core_app.serializers import CustomTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync property overview (WSGI path) with its async variant (ASGI path) under concurrent "
+        "load, with every query delayed to simulate a slow database. The async fan-out reads on other "
+        "connections, so the rows must be committed: they go into a throwaway test database (created like "
+        "the test runner's, dropped afterwards) and caches are process-local for the run, so nothing touches "
+        "live data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per path")
+        parser.add_argument('--concurrency', type=int, default=20, help="Requests in flight at once")
+        parser.add_argument('--delay', type=float, default=20, help="Milliseconds added to every query")
+        parser.add_argument('--units', type=int, default=20, help="Units (each with a tenant) in the property")
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help="Drop a leftover test database without asking",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=not options['interactive'], serialize=False,
+        )
+        try:
+            # Token, access-scope and response-cache keys hold ids of the test database
+            with override_settings(
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                    'LOCATION': 'benchmark-async'}},
+                RESPONSE_CACHE_ALIAS='default',
+                # The Django test clients always send Host: testserver
+                ALLOWED_HOSTS=['testserver'],
+            ):
+                self.benchmark(options)
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def benchmark(self, options):
+        owner, prop = self.seed(options['units'])
+        delay = options['delay'] / 1000
+
+        def slow_query(execute, sql, params, many, context):
+            time.sleep(delay)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            # Fires on every reconnect of the same per-thread wrapper
+            if slow_query not in connection.execute_wrappers:
+                connection.execute_wrappers.append(slow_query)
+
+        # Every thread opens its own connection; delay them all, not just this thread's
+        connections.close_all()
+        connection_created.connect(install)
+        try:
+            token = str(CustomTokenObtainPairSerializer.get_token(owner).access_token)
+            headers = {'Authorization': f'Bearer {token}'}
+            self.stdout.write(
+                f"{options['requests']} requests per path, {options['concurrency']} concurrent, "
+                f"{options['delay']:g} ms per query"
+            )
+            self.report('sync  (WSGI)', self.run_sync(
+                reverse('overview_by_property', args=[prop.id]), headers, options['requests'], options['concurrency']
+            ))
+            self.report('async (ASGI)', asyncio.run(self.run_async(
+                reverse('overview_by_property_async', args=[prop.id]), headers, options['requests'],
+                options['concurrency'],
+            )))
+        finally:
+            connection_created.disconnect(install)
+            for connection in connections.all():
+                if slow_query in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(slow_query)
+
+    def seed(self, unit_count):
+        owner = User.objects.create(
+            username='benchmark-async-owner', email='benchmark-async-owner@example.com',
+            phone_number='000000000010', role='landlord',
+        )
+        prop = Property.objects.create(owner=owner, name='Benchmark', address='-')
+        tenant_users = User.objects.bulk_create([
+            User(username=f'benchmark-async-{i}', email=f'benchmark-async-{i}@example.com',
+                 phone_number=f'9{i:011d}', role='tenant')
+            for i in range(unit_count)
+        ])
+        tenants = TenantProfile.objects.bulk_create([TenantProfile(user=user) for user in tenant_users])
+        units = Unit.objects.bulk_create([
+            Unit(property=prop, unit_number=f'A-{i}', rent=1000, status='occupied') for i in range(unit_count)
+        ])
+        TenantUnit.objects.bulk_create([
+            TenantUnit(tenant=tenant, unit=unit, move_in_date=date.today()) for tenant, unit in zip(tenants, units)
+        ])
+        Payment.objects.bulk_create([
+            Payment(tenant=tenant, unit=unit, property=prop, amount=1000,
+                    due_date=date.today() - timedelta(days=30 * month), status='paid' if month else 'pending')
+            for tenant, unit in zip(tenants, units) for month in range(3)
+        ])
+        MaintenanceRequest.objects.bulk_create([
+            MaintenanceRequest(tenant=tenant, unit=unit, property=prop, description='Benchmark request')
+            for tenant, unit in zip(tenants, units)
+        ])
+        return owner, prop
+
+    def run_sync(self, url, headers, requests, concurrency):
+        def call(_):
+            started = time.perf_counter()
+            response = Client().get(url, headers=headers)
+            assert response.status_code == 200, response.content
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(call, range(requests)))
+        return latencies, time.perf_counter() - started
+
+    async def run_async(self, url, headers, requests, concurrency):
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                assert response.status_code == 200, response.content
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(call() for _ in range(requests)))
+        return latencies, time.perf_counter() - started
+
+    def report(self, name, result):
+        latencies, elapsed = result
+        latencies = sorted(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"{name}  {len(latencies) / elapsed:>8.1f} req/s   "
+            f"p50 {statistics.median(latencies) * 1000:>7.1f} ms   p95 {p95 * 1000:>7.1f} ms"
+        )
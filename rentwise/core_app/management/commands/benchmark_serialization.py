@@ -0,0 +1,89 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core_app.fastpath import compile_values_plan
+from core_app.models import User, Property, Unit, TenantProfile, Payment, MaintenanceRequest
+from core_app.renderers import FastJSONRenderer, orjson
+from core_app.serializers import UnitSerializer, PaymentSerializer, MaintenanceRequestSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure rows/sec of the list endpoints through the serializer + stdlib JSON renderer and "
+        "through the values() fast path + FastJSONRenderer. Seeds its own rows and rolls them back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help="Rows per endpoint")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is kept")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['rows'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, rows):
+        owner = User.objects.create(
+            username='benchmark-owner', email='benchmark-owner@example.com', phone_number='000000000000',
+            role='landlord',
+        )
+        tenant_user = User.objects.create(
+            username='benchmark-tenant', email='benchmark-tenant@example.com', phone_number='000000000001',
+            role='tenant',
+        )
+        tenant = TenantProfile.objects.create(user=tenant_user)
+        prop = Property.objects.create(owner=owner, name='Benchmark', address='-')
+        units = Unit.objects.bulk_create(
+            [Unit(property=prop, unit_number=f'B-{i}', rent=1000 + i % 500) for i in range(rows)],
+            batch_size=1000,
+        )
+        start = date.today()
+        Payment.objects.bulk_create([
+            Payment(tenant=tenant, unit=unit, property=prop, amount=unit.rent,
+                    due_date=start + timedelta(days=i % 365), status='pending')
+            for i, unit in enumerate(units)
+        ], batch_size=1000)
+        MaintenanceRequest.objects.bulk_create([
+            MaintenanceRequest(tenant=tenant, unit=unit, property=prop, description=f'Request {i}')
+            for i, unit in enumerate(units)
+        ], batch_size=1000)
+        return prop
+
+    def measure(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def run(self, rows, repeat):
+        prop = self.seed(rows)
+        endpoints = [
+            ('UnitsByPropertyView', Unit.objects.filter(property=prop), UnitSerializer),
+            ('PaymentViewSet.list', Payment.objects.filter(property=prop), PaymentSerializer),
+            ('MaintenanceRequestViewSet.list', MaintenanceRequest.objects.filter(property=prop),
+             MaintenanceRequestSerializer),
+        ]
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        self.stdout.write(f"{rows} rows per endpoint, best of {repeat}; orjson {'on' if orjson else 'not installed'}")
+        for name, queryset, serializer_class in endpoints:
+            plan = compile_values_plan(serializer_class())
+            before = self.measure(lambda: stdlib.render(serializer_class(queryset, many=True).data), repeat)
+            after = self.measure(lambda: fast.render(plan.render(queryset.values(*plan.columns))), repeat)
+            self.stdout.write(
+                f"{name:32} before {rows / before:>10,.0f} rows/s   "
+                f"after {rows / after:>10,.0f} rows/s   x{before / after:.1f}"
+            )
@@ -0,0 +1,31 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core_app.importers import STATEMENT_FORMATS, PaymentImporter, read_statement
+
+
+class Command(BaseCommand):
+    help = "Stream a bank / mobile-money statement (CSV or JSON lines) into Payment records."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Statement file")
+        parser.add_argument('--format', dest='file_format', choices=STATEMENT_FORMATS,
+                            help="Statement format (default: from the file extension)")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in STATEMENT_FORMATS:
+            raise CommandError(f"Cannot tell the statement format of {path}; pass --format")
+
+        try:
+            with open(path, 'rb') as statement:
+                importer = PaymentImporter(batch_size=options['batch_size'])
+                summary = importer.run(read_statement(statement, file_format))
+        except OSError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(json.dumps(summary, indent=2))
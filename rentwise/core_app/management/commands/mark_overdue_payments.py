@@ -0,0 +1,17 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from core_app.billing import mark_overdue_payments
+
+
+class Command(BaseCommand):
+    help = "Move pending payments past their due date to overdue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', type=date.fromisoformat, help="Treat this date (YYYY-MM-DD) as today")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        result = mark_overdue_payments(as_of=options['as_of'], batch_size=options['batch_size'])
+        self.stdout.write(f"Marked {result['transitioned']} payments overdue in {result['elapsed']}s")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core_app.ledger import rebuild_ledger, verify_ledger
+
+
+class Command(BaseCommand):
+    help = "Rebuild the PropertyLedger rollup from the Payment table and verify it against the raw rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify-only', action='store_true',
+                            help="Only compare the ledger with the raw rows, do not rebuild it")
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            rows = rebuild_ledger()
+            self.stdout.write(f"Rebuilt {rows} ledger rows")
+
+        mismatches = verify_ledger()
+        for property_id, month, field, stored, expected in mismatches:
+            self.stdout.write(self.style.WARNING(
+                f"property {property_id} {month:%Y-%m} {field}: ledger {stored}, payments {expected}"
+            ))
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} ledger values do not match the payments")
+        self.stdout.write(self.style.SUCCESS("Ledger matches payments"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['status', 'request_date'], name='maint_status_request_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(condition=models.Q(('status__in', ['open', 'in_progress'])), fields=['request_date'], name='maint_open_request_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'due_date'], name='payment_status_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'overdue'])), fields=['due_date'], name='payment_unpaid_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tenantunit',
+            index=models.Index(fields=['unit', 'move_out_date'], name='tenantunit_unit_move_out_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='unit',
+            index=models.Index(fields=['property', 'status'], name='unit_property_status_idx'),
+        ),
+    ]
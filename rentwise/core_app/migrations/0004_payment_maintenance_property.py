@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0003_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='property',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='maintenance_requests', to='core_app.property'),
+        ),
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='unit',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='maintenance_requests', to='core_app.unit'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='property',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='core_app.property'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='unit',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='core_app.unit'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['property', 'request_date', 'id'], name='maint_property_request_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['property', 'due_date', 'id'], name='payment_property_due_idx'),
+        ),
+    ]
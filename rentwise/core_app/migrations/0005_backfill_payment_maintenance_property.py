@@ -0,0 +1,55 @@
+from django.db import migrations
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    TenantUnit = apps.get_model('core_app', 'TenantUnit')
+
+    for model_name in ['Payment', 'MaintenanceRequest']:
+        model = apps.get_model('core_app', model_name)
+        last_id = 0
+        while True:
+            batch = list(
+                model.objects.filter(id__gt=last_id, property__isnull=True)
+                .order_by('id').only('id', 'tenant_id')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            # The tenant's only current lease (TenantUnitQuerySet.placements); rows of
+            # tenants with none or several stay unattributed
+            today = timezone.localdate()
+            leases = (
+                TenantUnit.objects.filter(tenant_id__in={row.tenant_id for row in batch})
+                .filter(Q(move_out_date__isnull=True) | Q(move_out_date__gte=today))
+                .order_by().values('tenant_id')
+                .annotate(
+                    lease_count=Count('id'), placed_unit_id=Max('unit_id'),
+                    placed_property_id=Max('unit__property_id'),
+                )
+                .filter(lease_count=1)
+            )
+            placements = {row['tenant_id']: (row['placed_unit_id'], row['placed_property_id']) for row in leases}
+
+            updated = []
+            for row in batch:
+                if row.tenant_id in placements:
+                    row.unit_id, row.property_id = placements[row.tenant_id]
+                    updated.append(row)
+            model.objects.bulk_update(updated, ['unit', 'property'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core_app', '0004_payment_maintenance_property'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
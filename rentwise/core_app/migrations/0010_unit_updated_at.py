@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0009_payment_billing_period'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unit',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['property', 'updated_at'], name='payment_property_updated_idx'),
+        ),
+    ]
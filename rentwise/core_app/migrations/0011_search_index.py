@@ -0,0 +1,84 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:55
+
+from django.db import migrations
+
+# table -> (indexed columns, PostgreSQL text search config, SQLite FTS5 tokenizer)
+SEARCH_TABLES = {
+    'core_app_maintenancerequest': (['description'], 'english', 'porter unicode61'),
+    'core_app_property': (['name', 'address'], 'simple', 'unicode61'),
+    'core_app_unit': (['unit_number'], 'simple', 'unicode61'),
+    'core_app_user': (['first_name', 'last_name', 'email', 'phone_number'], 'simple', 'unicode61'),
+}
+
+
+def postgresql_statements(table, columns, config):
+    # A stored generated column is kept current by PostgreSQL on every insert and update, bulk writes included
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    return [
+        f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{config}'::regconfig, {document})) STORED",
+        f"CREATE INDEX {table}_search_idx ON {table} USING gin (search_vector)",
+    ], [
+        f"DROP INDEX IF EXISTS {table}_search_idx",
+        f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector",
+    ]
+
+
+def sqlite_statements(table, columns, tokenizer):
+    # External-content FTS5 table synced by triggers. SQLite drops a table's triggers when
+    # a later AlterField rebuilds it, so such a migration must recreate them.
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        f"tokenize='{tokenizer}')",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END",
+    ], [
+        f"DROP TRIGGER IF EXISTS {fts}_insert",
+        f"DROP TRIGGER IF EXISTS {fts}_delete",
+        f"DROP TRIGGER IF EXISTS {fts}_update",
+        f"DROP TABLE IF EXISTS {fts}",
+    ]
+
+
+def statements(vendor):
+    """(forward, backward) SQL for ``vendor``; other databases fall back to unindexed search."""
+    forward, backward = [], []
+    for table, (columns, config, tokenizer) in SEARCH_TABLES.items():
+        if vendor == 'postgresql':
+            create, drop = postgresql_statements(table, columns, config)
+        elif vendor == 'sqlite':
+            create, drop = sqlite_statements(table, columns, tokenizer)
+        else:
+            continue
+        forward += create
+        backward += drop
+    return forward, backward
+
+
+def create_search_index(apps, schema_editor):
+    for sql in statements(schema_editor.connection.vendor)[0]:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    for sql in statements(schema_editor.connection.vendor)[1]:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0010_unit_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
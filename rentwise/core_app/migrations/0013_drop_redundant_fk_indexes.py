@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-17 04:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Single-column foreign key indexes whose column leads a composite index or unique
+# constraint, which serves the same lookups: (table, column, Django's generated name).
+# Dropped with plain SQL rather than AlterField: on SQLite AlterField rebuilds the
+# table, which would drop the search triggers of migration 0011
+REDUNDANT_INDEXES = [
+    ('core_app_maintenancerequest', 'property_id', 'core_app_maintenancerequest_property_id_51420b63'),
+    ('core_app_payment', 'property_id', 'core_app_payment_property_id_c20f4c08'),
+    ('core_app_payment', 'tenant_id', 'core_app_payment_tenant_id_cdf7b126'),
+    ('core_app_tenantunit', 'unit_id', 'core_app_tenantunit_unit_id_c21dcf2a'),
+    ('core_app_unit', 'property_id', 'core_app_unit_property_id_06c65280'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0012_unit_property_rent_idx'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=[f'DROP INDEX IF EXISTS "{name}"' for _, _, name in REDUNDANT_INDEXES],
+                    reverse_sql=[
+                        f'CREATE INDEX "{name}" ON "{table}" ("{column}")' for table, column, name in REDUNDANT_INDEXES
+                    ],
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='maintenancerequest',
+                    name='property',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='maintenance_requests', to='core_app.property'),
+                ),
+                migrations.AlterField(
+                    model_name='payment',
+                    name='property',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='core_app.property'),
+                ),
+                migrations.AlterField(
+                    model_name='payment',
+                    name='tenant',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='core_app.tenantprofile'),
+                ),
+                migrations.AlterField(
+                    model_name='tenantunit',
+                    name='unit',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='core_app.unit'),
+                ),
+                migrations.AlterField(
+                    model_name='unit',
+                    name='property',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='units', to='core_app.property'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncMonth
+
+ZERO = Decimal('0.00')
+
+
+def backfill(apps, schema_editor):
+    # Same aggregation as core_app.ledger.compute_ledger, on the historical models:
+    # payments recorded before the ledger existed were never added to it
+    Payment = apps.get_model('core_app', 'Payment')
+    PropertyLedger = apps.get_model('core_app', 'PropertyLedger')
+
+    rows = (
+        Payment.objects.exclude(property__isnull=True)
+        .annotate(month=TruncMonth(
+            Coalesce('due_date', 'payment_date', Cast('created_at', DateField())),
+            output_field=DateField(),
+        ))
+        .values('property_id', 'month')
+        .annotate(
+            billed=Coalesce(Sum('amount'), ZERO),
+            collected=Coalesce(Sum('amount', filter=Q(status='paid')), ZERO),
+            outstanding=Coalesce(Sum('amount', filter=~Q(status='paid')), ZERO),
+            overdue_count=Count('id', filter=Q(status='overdue')),
+        )
+        .order_by()
+    )
+    PropertyLedger.objects.all().delete()
+    PropertyLedger.objects.bulk_create([PropertyLedger(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_app', '0013_drop_redundant_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
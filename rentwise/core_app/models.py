@@ -1,5 +1,10 @@
+from decimal import Decimal
+
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -16,6 +21,8 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     phone_number = models.CharField(max_length=12, unique=True)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='tenant')
+    # Bumped whenever issued tokens must stop working (role, access or password change)
+    token_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -49,27 +56,61 @@ class Unit(models.Model):
         ('occupied', 'Occupied'),
         ('under maintenance', 'Under Maintenance'),
     ]
-    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='units')
+    # Indexed as the leading column of the composite indexes below
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='units', db_index=False)
     unit_number = models.CharField(max_length=50)
     size = models.CharField(max_length=50, blank=True, null=True)
     rent = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='available')
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('property', 'unit_number')
+        indexes = [
+            models.Index(fields=['property', 'status'], name='unit_property_status_idx'),
+            models.Index(fields=['property', 'rent'], name='unit_property_rent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.unit_number} - {self.property.name} ({self.status})"
 
 
+class TenantUnitQuerySet(models.QuerySet):
+    def current(self, on=None):
+        """Leases not moved out before ``on`` (default today)."""
+        on = on or timezone.localdate()
+        return self.filter(Q(move_out_date__isnull=True) | Q(move_out_date__gte=on))
+
+    def placements(self):
+        """
+        ``{tenant_id: (unit_id, property_id)}`` for every tenant with exactly one
+        lease in the queryset, in one grouped query.
+
+        This is the one placement rule for rows recorded without a unit: use
+        ``TenantUnit.objects.current().placements()``. Tenants with several
+        leases are left out, their rows stay unattributed.
+        """
+        rows = self.order_by().values('tenant_id').annotate(
+            lease_count=Count('id'), placed_unit_id=Max('unit_id'), placed_property_id=Max('unit__property_id'),
+        ).filter(lease_count=1)
+        return {row['tenant_id']: (row['placed_unit_id'], row['placed_property_id']) for row in rows}
+
+
 class TenantUnit(models.Model):
     tenant = models.ForeignKey("TenantProfile", on_delete=models.CASCADE)
-    unit = models.ForeignKey("Unit", on_delete=models.CASCADE)
+    # Indexed as the leading column of tenantunit_unit_move_out_idx
+    unit = models.ForeignKey("Unit", on_delete=models.CASCADE, db_index=False)
     move_in_date = models.DateField(null=True, blank=True)
     move_out_date = models.DateField(null=True, blank=True)
 
+    objects = TenantUnitQuerySet.as_manager()
+
     class Meta:
         unique_together = ("tenant", "unit")
+        indexes = [
+            # Current occupancy: move_out_date IS NULL or in the future
+            models.Index(fields=['unit', 'move_out_date'], name='tenantunit_unit_move_out_idx'),
+        ]
 
     def __str__(self):
         return f"{self.tenant.user.email} -> {self.unit.unit_number}"
@@ -83,6 +124,13 @@ class TenantProfile(models.Model):
         unit_list = ", ".join([u.unit_number for u in self.units.all()])
         return f"{self.user.email} - Units: {unit_list if unit_list else 'No Units Assigned'}"
 
+    def current_placement(self):
+        """
+        Return ``(unit_id, property_id)`` of the tenant's only current lease, or
+        ``(None, None)`` when they have none or several (the row is then ambiguous).
+        """
+        return TenantUnit.objects.filter(tenant=self).current().placements().get(self.id, (None, None))
+
 
 class ManagerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='manager_profile')
@@ -101,26 +149,106 @@ class CaretakerProfile(models.Model):
         return f"{self.user.email} - {self.assigned_property.name if self.assigned_property else 'No Property Assigned'}"
 
 
+def fill_unit_and_property(instance):
+    """
+    Populate the denormalized ``unit`` / ``property`` columns of a tenant-owned row.
+
+    They let property-scoped queries filter a single table instead of joining
+    through ``tenant__units__property`` and de-duplicating with DISTINCT. The
+    property always follows the row's unit; a row without a unit takes the
+    tenant's only current lease, and stays unattributed when there is none or
+    several until ``core_app.leases.attribute_unplaced_rows`` fills it in.
+    """
+    if instance.unit_id is not None:
+        instance.property_id = instance.unit.property_id
+    elif instance.tenant_id is not None and instance.property_id is None:
+        instance.unit_id, instance.property_id = instance.tenant.current_placement()
+
+
+class PaymentQuerySet(models.QuerySet):
+    def totals(self):
+        """Sum amounts and count rows per status in a single aggregate query."""
+        zero = Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2))
+        return self.aggregate(
+            total_due=Coalesce(Sum('amount', filter=~Q(status='paid')), zero),
+            total_collected=Coalesce(Sum('amount', filter=Q(status='paid')), zero),
+            paid_count=Count('id', filter=Q(status='paid')),
+            pending_count=Count('id', filter=Q(status='pending')),
+            overdue_count=Count('id', filter=Q(status='overdue')),
+        )
+
+
 class Payment(models.Model):
     STATUS_CHOICES = [
         ('paid', 'Paid'),
         ('pending', 'Pending'),
         ('overdue', 'Overdue'),
     ]
-    tenant = models.ForeignKey(TenantProfile, on_delete=models.CASCADE, related_name='payments')
+    # tenant and property are indexed as the leading columns of the unique
+    # constraint and the composite indexes below
+    tenant = models.ForeignKey(TenantProfile, on_delete=models.CASCADE, related_name='payments', db_index=False)
+    unit = models.ForeignKey(Unit, on_delete=models.SET_NULL, null=True, blank=True, related_name='payments')
+    property = models.ForeignKey(
+        Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='payments', db_index=False,
+    )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     due_date = models.DateField(null=True, blank=True)
     payment_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Bank / mobile-money transaction reference, used to skip re-imported statement lines
+    reference = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    # First day of the month an invoice generated by core_app.billing belongs to
+    billing_period = models.DateField(null=True, blank=True)
+
+    objects = PaymentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['due_date', 'id'], name='payment_due_date_id_idx'),
+            models.Index(fields=['property', 'due_date', 'id'], name='payment_property_due_idx'),
+            models.Index(fields=['status', 'due_date'], name='payment_status_due_date_idx'),
+            # Conditional GET validators: COUNT / MAX(updated_at) per property
+            models.Index(fields=['property', 'updated_at'], name='payment_property_updated_idx'),
+            # Arrears queries only ever look at unpaid rows
+            models.Index(
+                fields=['due_date'], name='payment_unpaid_due_date_idx',
+                condition=Q(status__in=['pending', 'overdue']),
+            ),
+        ]
+        constraints = [
+            # One invoice per lease per billing cycle; manual payments leave billing_period empty
+            models.UniqueConstraint(
+                fields=['tenant', 'unit', 'billing_period'], name='payment_unique_billing_period',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.tenant.user.email} - {self.amount} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        fill_unit_and_property(self)
+        # The ledger receivers in core_app.signals lock the previous row and
+        # apply their delta inside this transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
 
 class MaintenanceRequest(models.Model):
     tenant = models.ForeignKey(TenantProfile, on_delete=models.CASCADE, related_name='maintenance_requests')
+    unit = models.ForeignKey(
+        Unit, on_delete=models.SET_NULL, null=True, blank=True, related_name='maintenance_requests'
+    )
+    # Indexed as the leading column of maint_property_request_idx
+    property = models.ForeignKey(
+        Property, on_delete=models.SET_NULL, null=True, blank=True, related_name='maintenance_requests',
+        db_index=False,
+    )
     description = models.TextField()
     request_date = models.DateTimeField(auto_now_add=True)
     completion_date = models.DateTimeField(null=True, blank=True)
@@ -130,7 +258,42 @@ class MaintenanceRequest(models.Model):
         default='open'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['request_date', 'id'], name='maint_request_date_id_idx'),
+            models.Index(fields=['property', 'request_date', 'id'], name='maint_property_request_idx'),
+            models.Index(fields=['status', 'request_date'], name='maint_status_request_date_idx'),
+            models.Index(
+                fields=['request_date'], name='maint_open_request_date_idx',
+                condition=Q(status__in=['open', 'in_progress']),
+            ),
+        ]
+
     def __str__(self):
         unit_list = ", ".join([u.unit_number for u in self.tenant.units.all()])
         return f"Request by {self.tenant.user.email} for units {unit_list} - {self.status}"
 
+    def save(self, *args, **kwargs):
+        fill_unit_and_property(self)
+        super().save(*args, **kwargs)
+
+
+class PropertyLedger(models.Model):
+    """
+    Monthly financial rollup per property, kept current by the Payment signals
+    in ``core_app.signals`` through the helpers in ``core_app.ledger``. Filled
+    from existing payments by migration 0014; rebuild with ``manage.py rebuild_ledger``.
+    """
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='ledger')
+    month = models.DateField()
+    billed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    collected = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    outstanding = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    overdue_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('property', 'month')
+
+    def __str__(self):
+        return f"{self.property.name} {self.month:%Y-%m}: {self.collected}/{self.billed}"
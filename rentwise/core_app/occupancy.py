@@ -0,0 +1,191 @@
+from datetime import date
+
+import numpy as np
+from django.db.models import Count, Func, IntegerField, Value
+from django.db.models.functions import Coalesce
+
+from .models import Property, Unit, TenantUnit
+
+GRANULARITIES = ['day', 'month']
+# Stands in for an empty move-in / move-out date in the integer day columns
+NO_DATE = -1_000_000
+# Upper bound on periods per response (about two years of days)
+MAX_PERIODS = 750
+
+
+def period_starts(start, end, granularity):
+    """``datetime64[D]`` array with the first day of every period between ``start`` and ``end``."""
+    first, last = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    if granularity == 'day':
+        return np.arange(first, last + 1)
+    months = np.arange(first.astype('datetime64[M]'), last.astype('datetime64[M]') + 1).astype('datetime64[D]')
+    months[0] = first
+    return months
+
+
+class EpochDays(Func):
+    """Days between 1970-01-01 and a date column, computed by the database as an integer."""
+    output_field = IntegerField()
+    template = "(%(expressions)s - DATE '1970-01-01')"
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="CAST(julianday(%(expressions)s) - 2440587.5 AS INTEGER)", **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="DATEDIFF(%(expressions)s, '1970-01-01')", **extra_context)
+
+
+def _merge_per_unit(unit, prop, starts, ends, open_start, open_end):
+    """
+    Merge overlapping or touching lease intervals of the same unit, so a unit
+    shared by several tenants is counted once. Inputs must be sorted by
+    ``(unit, start)``; returns the merged arrays.
+    """
+    # Offset every unit into its own band so a running maximum never crosses units
+    band = np.int64(ends.max() - starts.min() + 2) if len(ends) else np.int64(1)
+    _, unit_rank = np.unique(unit, return_inverse=True)
+    base = unit_rank * band
+    reach = np.maximum.accumulate(base + ends - starts.min())
+    previous_reach = np.concatenate(([np.int64(-1)], reach[:-1]))
+    new_group = (base + starts - starts.min()) > previous_reach + 1
+    new_group[0] = True
+    first = np.flatnonzero(new_group)
+    # A merged interval is open-ended as soon as one of its leases is
+    return (
+        prop[first], starts[first], np.maximum.reduceat(ends, first),
+        open_start[first], np.logical_or.reduceat(open_end, first),
+    )
+
+
+def _occupied_before(keys, prefix, group_first, group, t, stride):
+    """Sum over each group's intervals of ``max(0, t - x)`` for the sorted ``x`` values behind ``keys``."""
+    index = np.searchsorted(keys, group * stride + t, side='left')
+    count = index - group_first[group]
+    return count * t - (prefix[index] - prefix[group_first[group]])
+
+
+def occupancy_report(property_ids, start, end, granularity='month'):
+    """
+    Occupancy, vacancy days, move-ins / move-outs and average lease length per property.
+
+    Lease intervals are loaded once into NumPy arrays and every figure is
+    computed with array operations: occupied unit-days per period come from
+    sorted interval bounds and prefix sums (``searchsorted``), never from a
+    loop over days. An empty ``move_in_date`` counts from ``start`` and an
+    empty ``move_out_date`` as still occupied. The unit count of a property is
+    its current number of units.
+    """
+    periods = period_starts(start, end, granularity)
+    first_day, last_day = np.datetime64(start, 'D').astype(np.int64), np.datetime64(end, 'D').astype(np.int64)
+    bounds = np.concatenate((periods.astype(np.int64), [last_day + 1])) - first_day
+    lengths = np.diff(bounds)
+
+    properties = Property.objects.order_by('id')
+    units = Unit.objects.all()
+    leases = TenantUnit.objects.filter(unit__isnull=False)
+    if property_ids is not None:
+        properties = properties.filter(id__in=property_ids)
+        units = units.filter(property_id__in=property_ids)
+        leases = leases.filter(unit__property_id__in=property_ids)
+    leases = leases.exclude(move_in_date__gt=end).exclude(move_out_date__lt=start)
+
+    property_list = list(properties.values_list('id', 'name'))
+    property_index = {property_id: i for i, (property_id, _) in enumerate(property_list)}
+    unit_counts = np.zeros(len(property_list), dtype=np.int64)
+    for property_id, count in units.order_by().values_list('property_id').annotate(count=Count('id')):
+        unit_counts[property_index[property_id]] = count
+
+    # Dates arrive as integer day numbers, so the rows convert to one int64 array in a single step
+    rows = np.array(list(leases.values_list(
+        'unit_id', 'unit__property_id',
+        Coalesce(EpochDays('move_in_date'), Value(NO_DATE)),
+        Coalesce(EpochDays('move_out_date'), Value(NO_DATE)),
+    )), dtype=np.int64).reshape(-1, 4)
+    n_props, n_periods = len(property_list), len(periods)
+    occupied = np.zeros((n_props, n_periods), dtype=np.int64)
+    move_ins = np.zeros((n_props, n_periods), dtype=np.int64)
+    move_outs = np.zeros((n_props, n_periods), dtype=np.int64)
+    lease_days = np.zeros(n_props, dtype=np.int64)
+    lease_count = np.zeros(n_props, dtype=np.int64)
+
+    if len(rows):
+        unit = rows[:, 0]
+        # property_list is ordered by id, so positions can be found by binary search
+        prop = np.searchsorted(np.array([property_id for property_id, _ in property_list]), rows[:, 1])
+        open_start, open_end = rows[:, 2] == NO_DATE, rows[:, 3] == NO_DATE
+        raw_start = np.where(open_start, first_day, rows[:, 2])
+        raw_end = np.where(open_end, last_day, rows[:, 3])
+
+        # Average length of the leases that ended within the range
+        closed = ~open_start & ~open_end & (raw_end >= first_day) & (raw_end <= last_day)
+        lease_days = np.bincount(prop[closed], weights=raw_end[closed] - raw_start[closed] + 1, minlength=n_props)
+        lease_count = np.bincount(prop[closed], minlength=n_props)
+
+        # Day offsets from ``start``, clipped to the range; inclusive ends
+        starts = np.clip(raw_start, first_day, last_day + 1) - first_day
+        ends = np.clip(raw_end, first_day - 1, last_day) - first_day
+        open_start |= raw_start < first_day
+        open_end |= raw_end > last_day
+        keep = starts <= ends
+        order = np.lexsort((starts[keep], unit[keep]))
+        prop, starts, ends, open_start, open_end = _merge_per_unit(
+            unit[keep][order], prop[keep][order], starts[keep][order], ends[keep][order],
+            open_start[keep][order], open_end[keep][order],
+        )
+
+        if len(prop):
+            # occupied unit-days before day t = sum(max(0, t - start)) - sum(max(0, t - (end + 1)))
+            stride = np.int64(bounds[-1] + 2)
+            group_first = np.searchsorted(
+                np.sort(prop * stride), np.arange(n_props, dtype=np.int64) * stride, side='left'
+            )
+            t = np.broadcast_to(bounds, (n_props, n_periods + 1))
+            group = np.broadcast_to(np.arange(n_props, dtype=np.int64)[:, None], t.shape)
+            totals = np.zeros(t.shape, dtype=np.int64)
+            for values, sign in ((starts, 1), (ends + 1, -1)):
+                keys = np.sort(prop * stride + values)
+                prefix = np.concatenate(([0], np.cumsum(keys - (keys // stride) * stride)))
+                totals += sign * _occupied_before(keys, prefix, group_first, group, t, stride)
+            occupied = np.diff(totals, axis=1)
+
+            # Move-ins / move-outs of the merged intervals, counted per (property, period) cell
+            cells = prop * n_periods
+            ins, outs = ~open_start, ~open_end
+            move_ins = np.bincount(
+                cells[ins] + np.searchsorted(bounds, starts[ins], side='right') - 1, minlength=n_props * n_periods
+            ).reshape(n_props, n_periods)
+            move_outs = np.bincount(
+                cells[outs] + np.searchsorted(bounds, ends[outs], side='right') - 1, minlength=n_props * n_periods
+            ).reshape(n_props, n_periods)
+
+    unit_days = unit_counts[:, None] * lengths[None, :]
+    vacancy = np.maximum(unit_days - occupied, 0)
+    rate = np.where(unit_days > 0, occupied / np.maximum(unit_days, 1), 0.0)
+
+    report = []
+    for i, (property_id, name) in enumerate(property_list):
+        total_unit_days = int(unit_days[i].sum())
+        report.append({
+            'id': property_id,
+            'name': name,
+            'unit_count': int(unit_counts[i]),
+            'occupancy_rate': round(float(occupied[i].sum()) / total_unit_days, 4) if total_unit_days else 0.0,
+            'vacancy_days': int(vacancy[i].sum()),
+            'turnover': int(move_outs[i].sum()),
+            'average_lease_days': round(float(lease_days[i]) / int(lease_count[i]), 1) if lease_count[i] else None,
+            'series': {
+                'occupancy_rate': np.round(rate[i], 4).tolist(),
+                'vacancy_days': vacancy[i].tolist(),
+                'move_ins': move_ins[i].tolist(),
+                'move_outs': move_outs[i].tolist(),
+            },
+        })
+    return {
+        'start': date.fromisoformat(str(periods[0])),
+        'end': end,
+        'granularity': granularity,
+        'periods': [str(day) for day in periods],
+        'properties': report,
+    }
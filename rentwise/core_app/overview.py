@@ -0,0 +1,79 @@
+from .access import get_accessible_property_ids
+from .fastpath import serialize_rows
+from .fieldsets import apply_query_plan
+from .models import (
+    User, Unit, TenantUnit, TenantProfile, ManagerProfile, CaretakerProfile, Payment, MaintenanceRequest,
+)
+from .serializers import (
+    UserSerializer, UnitSerializer, TenantProfileSerializer, CaretakerProfileSerializer,
+    MaintenanceRequestSerializer,
+)
+
+OPEN_MAINTENANCE_STATUSES = ['open', 'in_progress']
+
+
+def _profile_data(model, serializer_class, user):
+    profile = model.objects.filter(user_id=user.pk).first()
+    return serializer_class(profile).data if profile else None
+
+
+def _managed_properties(user):
+    if not ManagerProfile.objects.filter(user_id=user.pk).exists():
+        return None
+    return {'managed_properties': sorted(get_accessible_property_ids(user))}
+
+
+def current_user_parts(user):
+    """
+    The independent lookups behind ``/me/`` as ``{key: callable}``.
+
+    Each callable runs its own queries and shares no state with the others,
+    so they can run one after another or concurrently; combine the results
+    with ``current_user_data``.
+    """
+    parts = {'user': lambda: UserSerializer(User.objects.get(pk=user.pk)).data}
+    # Include the profile matching the user's role
+    if user.role == 'tenant':
+        parts['tenant_profile'] = lambda: _profile_data(TenantProfile, TenantProfileSerializer, user)
+    elif user.role == 'caretaker':
+        parts['caretaker_profile'] = lambda: _profile_data(CaretakerProfile, CaretakerProfileSerializer, user)
+    elif user.role == 'property_manager':
+        parts['manager_profile'] = lambda: _managed_properties(user)
+    elif user.role == 'landlord':
+        parts['properties'] = lambda: sorted(get_accessible_property_ids(user))
+    return parts
+
+
+def current_user_data(results):
+    """Merge ``{key: result}`` of ``current_user_parts`` into the ``/me/`` payload; missing profiles are left out."""
+    data = results.pop('user')
+    data.update((key, value) for key, value in results.items() if value is not None)
+    return data
+
+
+def _property_tenants(property_id, request):
+    tenants = apply_query_plan(
+        TenantProfile.objects.filter(
+            id__in=TenantUnit.objects.filter(unit__property_id=property_id).values('tenant_id')
+        ),
+        TenantProfileSerializer, request,
+    )
+    return TenantProfileSerializer(tenants, many=True, context={'request': request}).data
+
+
+def property_overview_parts(property_id, request):
+    """
+    The independent lookups behind a property overview as ``{key: callable}``:
+    units, tenants, payment totals and open maintenance requests. Check
+    access to the property before calling any of them.
+    """
+    return {
+        'units': lambda: serialize_rows(Unit.objects.filter(property_id=property_id), UnitSerializer, request),
+        'tenants': lambda: _property_tenants(property_id, request),
+        'payment_totals': lambda: Payment.objects.filter(property_id=property_id).totals(),
+        'open_maintenance': lambda: serialize_rows(
+            MaintenanceRequest.objects.filter(property_id=property_id, status__in=OPEN_MAINTENANCE_STATUSES)
+            .order_by('-request_date', '-id'),
+            MaintenanceRequestSerializer, request,
+        ),
+    }
@@ -0,0 +1,227 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a fixed, index-backed ordering.
+
+    Unlike OFFSET paging, each page is fetched with a ``WHERE (a, b) > (x, y)``
+    predicate taken from the last row of the previous page, so the cost of a
+    page does not depend on how deep the client has scrolled. The cursor is an
+    opaque token holding the ordering values of the boundary row.
+
+    ``ordering`` must end in a unique column (normally ``id``). Fields listed in
+    ``nullable_fields`` are ordered NULLS LAST (ascending) or NULLS FIRST
+    (descending), matching PostgreSQL's default b-tree order.
+
+    ``?ordering=`` accepts the first ordering field or its opposite
+    (``due_date`` / ``-due_date``); the reversed ordering is the same index
+    scanned backwards, so no other orderings are offered.
+    """
+    ordering = ('id',)
+    nullable_fields = ()
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_query_param = 'ordering'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 50
+        self.max_page_size = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 500)
+        self.keyset = [
+            (name.lstrip('-'), name.startswith('-')) for name in self.ordering
+        ]
+
+    def get_keyset(self, request):
+        """The keyset for ``request``: ``ordering``, or all of it reversed for the opposite ``?ordering=``."""
+        requested = request.query_params.get(self.ordering_query_param)
+        name, descending = self.keyset[0]
+        allowed = {('-' if descending else '') + name: False, ('' if descending else '-') + name: True}
+        if not requested:
+            return self.keyset
+        if requested not in allowed:
+            raise ValidationError({self.ordering_query_param: [f"Must be one of: {', '.join(allowed)}"]})
+        if not allowed[requested]:
+            return self.keyset
+        return [(field, not descending) for field, descending in self.keyset]
+
+    # ---------------------------
+    # Cursor encoding
+    # ---------------------------
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': [_encode_value(v) for v in position], 'r': int(reverse)})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        """The ``(position, reverse)`` of the request's cursor, with each value coerced by its model field."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            position = payload['p']
+            reverse = bool(payload['r'])
+            if not isinstance(position, list) or len(position) != len(self.keyset):
+                raise NotFound(self.invalid_cursor_message)
+            position = [
+                self._decode_value(model, name, value) for (name, _), value in zip(self.keyset, position)
+            ]
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _decode_value(self, model, name, value):
+        if value is None:
+            if name not in self.nullable_fields:
+                raise ValueError(f'{name} cannot be null')
+            return None
+        if isinstance(value, (list, dict)):
+            raise TypeError(f'{name} must be a scalar')
+        return model._meta.get_field(name).to_python(value)
+
+    # ---------------------------
+    # Query building
+    # ---------------------------
+    def _after(self, name, descending, value):
+        """Rows strictly after ``value`` on a single field, in forward order."""
+        nullable = name in self.nullable_fields
+        if not descending:
+            if value is None:
+                return Q(pk__in=[])
+            condition = Q(**{f'{name}__gt': value})
+            return condition | Q(**{f'{name}__isnull': True}) if nullable else condition
+        if value is None:
+            return Q(**{f'{name}__isnull': False})
+        return Q(**{f'{name}__lt': value})
+
+    def _equal(self, name, value):
+        if value is None:
+            return Q(**{f'{name}__isnull': True})
+        return Q(**{name: value})
+
+    def build_filter(self, position, reverse):
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for (name, descending), value in zip(self.keyset, position):
+            # Walking backwards is walking forwards over the flipped ordering
+            condition |= prefix & self._after(name, descending != reverse, value)
+            prefix &= self._equal(name, value)
+        return condition
+
+    def build_ordering(self, reverse):
+        order_by = []
+        for name, descending in self.keyset:
+            descending = descending != reverse
+            if name in self.nullable_fields:
+                expression = F(name).desc(nulls_first=True) if descending else F(name).asc(nulls_last=True)
+            else:
+                expression = F(name).desc() if descending else F(name).asc()
+            order_by.append(expression)
+        return order_by
+
+    # ---------------------------
+    # Pagination API
+    # ---------------------------
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        self.keyset = self.get_keyset(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        queryset = queryset.order_by(*self.build_ordering(reverse))
+        if position is not None:
+            queryset = queryset.filter(self.build_filter(position, reverse))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        page = rows[:page_size]
+        if reverse:
+            page.reverse()
+
+        # Pages of values() rows are dicts rather than model instances
+        getter = itemgetter if page and isinstance(page[0], dict) else attrgetter
+        getters = [getter(name) for name, _ in self.keyset]
+        self.next_position = self.previous_position = None
+        if page:
+            first = [get(page[0]) for get in getters]
+            last = [get(page[-1]) for get in getters]
+            # A backwards page always has a next page: the one we came from
+            has_next = True if reverse else has_more
+            has_previous = has_more if reverse else position is not None
+            if has_next:
+                self.next_position = last
+            if has_previous:
+                self.previous_position = first
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.next_position, False)
+        )
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(self.previous_position, True)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class PaymentPagination(KeysetPagination):
+    ordering = ('due_date', 'id')
+    nullable_fields = ('due_date',)
+
+
+class MaintenanceRequestPagination(KeysetPagination):
+    ordering = ('-request_date', '-id')
@@ -0,0 +1,58 @@
+from django.db.models import Count, Exists, OuterRef, Sum
+
+from .ledger import ZERO
+from .models import Property, Unit, PropertyLedger, MaintenanceRequest, TenantUnit
+
+
+def _grouped(queryset, property_ids, **aggregates):
+    """Run one ``GROUP BY property_id`` aggregate and return ``{property_id: row}``."""
+    if property_ids is not None:
+        queryset = queryset.filter(property_id__in=property_ids)
+    rows = queryset.order_by().values('property_id').annotate(**aggregates)
+    return {row.pop('property_id'): row for row in rows}
+
+
+def portfolio_summary(property_ids=None):
+    """
+    Per-property overview for ``property_ids`` (``None`` means every property).
+
+    Four queries whatever the number of properties: the properties, units
+    grouped by property, the ledger (already rolled up per month) grouped by
+    property, and open maintenance requests grouped by property.
+    """
+    properties = Property.objects.order_by('id')
+    if property_ids is not None:
+        properties = properties.filter(id__in=property_ids)
+
+    # Occupancy comes from current leases: nothing keeps Unit.status in step with them
+    current_lease = TenantUnit.objects.current().filter(unit_id=OuterRef('pk'))
+    units = _grouped(
+        Unit.objects.all(), property_ids,
+        unit_count=Count('id'), occupied_units=Count('id', filter=Exists(current_lease)),
+    )
+    ledger = _grouped(
+        PropertyLedger.objects.all(), property_ids,
+        outstanding_balance=Sum('outstanding'), overdue_count=Sum('overdue_count'),
+    )
+    maintenance = _grouped(
+        MaintenanceRequest.objects.filter(status__in=['open', 'in_progress']), property_ids,
+        open_maintenance_count=Count('id'),
+    )
+
+    summary = []
+    for property_id, name in properties.values_list('id', 'name'):
+        unit_row = units.get(property_id, {})
+        ledger_row = ledger.get(property_id, {})
+        unit_count = unit_row.get('unit_count', 0)
+        occupied = unit_row.get('occupied_units', 0)
+        summary.append({
+            'id': property_id,
+            'name': name,
+            'unit_count': unit_count,
+            'occupied_units': occupied,
+            'occupancy_rate': round(occupied / unit_count, 4) if unit_count else 0.0,
+            'outstanding_balance': ledger_row.get('outstanding_balance') or ZERO,
+            'overdue_count': ledger_row.get('overdue_count') or 0,
+            'open_maintenance_count': maintenance.get(property_id, {}).get('open_maintenance_count', 0),
+        })
+    return summary
@@ -0,0 +1,150 @@
+import hashlib
+import time
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .pagination import KeysetPagination
+from .routers import current_read_alias
+
+VERSION_KEY = 'property_version:{property_id}'
+RESPONSE_KEY = 'property_response:{view}:{property_id}:{version}:{role}:{params}'
+COUNTER_KEY = 'property_response_{kind}:{view}'
+CACHED_VIEWS = ['tenants', 'units', 'maintenance', 'payments']
+# Pagination links are absolute URLs; entries hold only their cursor
+LINK_FIELDS = ('next', 'previous')
+CURSOR_PARAM = KeysetPagination.cursor_query_param
+# Backends whose entries live inside one process: a version bumped by one worker is never seen by the others
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def versions_are_shared():
+    """Whether every worker reads the same property versions, i.e. the cache is not process-local."""
+    return not isinstance(get_cache(), PROCESS_LOCAL_BACKENDS)
+
+
+def get_property_version(property_id):
+    cache = get_cache()
+    key = VERSION_KEY.format(property_id=property_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so a version evicted from the cache never reuses an old number
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(property_ids):
+    cache = get_cache()
+    for property_id in property_ids:
+        key = VERSION_KEY.format(property_id=property_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_property_versions(*property_ids):
+    """
+    Invalidate every cached response of the given properties.
+
+    The bump waits for the surrounding transaction to commit, so a response
+    cached in the meantime cannot capture rows that are about to change.
+    Signals cover single-row saves and deletes; bulk writes must call this
+    themselves.
+    """
+    property_ids = {property_id for property_id in property_ids if property_id is not None}
+    if property_ids:
+        transaction.on_commit(lambda: _bump(property_ids))
+
+
+def _count(kind, view):
+    cache = get_cache()
+    key = COUNTER_KEY.format(kind=kind, view=view)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+
+def cache_stats():
+    """Return ``{view: {"hits": n, "misses": n}}`` for the cached per-property views."""
+    counters = get_cache().get_many([
+        COUNTER_KEY.format(kind=kind, view=view) for view in CACHED_VIEWS for kind in ('hits', 'misses')
+    ])
+    return {
+        view: {
+            kind: counters.get(COUNTER_KEY.format(kind=kind, view=view), 0) for kind in ('hits', 'misses')
+        }
+        for view in CACHED_VIEWS
+    }
+
+
+def _links_to_cursors(data):
+    if not isinstance(data, dict):
+        return data
+    data = dict(data)
+    for field in LINK_FIELDS:
+        if data.get(field):
+            data[field] = parse_qs(urlsplit(data[field]).query)[CURSOR_PARAM][0]
+    return data
+
+
+def _cursors_to_links(request, data):
+    if not isinstance(data, dict):
+        return data
+    url = request.build_absolute_uri()
+    for field in LINK_FIELDS:
+        if data.get(field):
+            data[field] = replace_query_param(url, CURSOR_PARAM, data[field])
+    return data
+
+
+def cached_property_response(request, view, property_id, respond):
+    """
+    Return the cached data of a per-property view, or call ``respond`` and cache its data.
+
+    Entries are keyed by view, property, property version, role and query
+    string, so any write to the property's units, leases, payments or
+    maintenance requests makes them unreachable. Only call this after the
+    access check. Responses using ``?expand=`` embed rows outside the
+    property version and are never cached. Responses read from a replica are
+    served from the cache but never stored: the replica may not have caught
+    up with the current version yet.
+
+    The cache is skipped altogether when it is process-local (locmem): a
+    version bumped by one worker would leave the others serving stale
+    entries. ``next`` / ``previous`` links are stored as bare cursors and
+    rebuilt from each request, so an entry never carries another client's
+    host or scheme.
+    """
+    if request.method != 'GET' or 'expand' in request.query_params or not versions_are_shared():
+        return respond()
+
+    params = hashlib.sha1(urlencode(sorted(request.query_params.lists()), doseq=True).encode()).hexdigest()
+    key = RESPONSE_KEY.format(
+        view=view, property_id=property_id, version=get_property_version(property_id),
+        role=request.user.role, params=params,
+    )
+    cache = get_cache()
+    data = cache.get(key)
+    if data is not None:
+        _count('hits', view)
+        return Response(_cursors_to_links(request, data))
+
+    _count('misses', view)
+    response = respond()
+    if response.status_code == 200 and current_read_alias() == DEFAULT_DB_ALIAS:
+        cache.set(key, _links_to_cursors(response.data), getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+    return response
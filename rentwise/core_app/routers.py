@@ -0,0 +1,157 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+PIN_KEY = 'replica_pin:{user_id}'
+
+_routing = ContextVar('replica_routing', default=None)
+_jwt = JWTAuthentication()
+
+
+class RoutingState:
+    """Where the current request reads from, and whether it has written yet."""
+
+    def __init__(self):
+        self.read_alias = DEFAULT_DB_ALIAS
+        self.wrote = False
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+
+
+def current_read_alias():
+    state = _routing.get()
+    if state is None or state.wrote or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return state.read_alias
+
+
+def end_routing():
+    """Send the rest of the current request's reads to the primary (runs when its response is closed)."""
+    state = _routing.get()
+    if state is not None:
+        state.read_alias = DEFAULT_DB_ALIAS
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to a replica while the request is routed to one, everything else to the primary.
+
+    Only ``ReplicaRoutingMiddleware`` routes a request to a replica, so
+    management commands, Celery tasks and unmarked views always read the
+    primary. Once a request writes, or inside a transaction, its remaining
+    reads go to the primary too, so it reads its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema by replicating the primary
+        return not db.startswith('replica_')
+
+
+def _request_user_id(request):
+    """
+    The user a request acts for, known before DRF authenticates it: the
+    user id claim of a valid access token, else the session user.
+    """
+    header = _jwt.get_header(request)
+    if header is not None:
+        raw_token = _jwt.get_raw_token(header)
+        try:
+            return AccessToken(raw_token)[api_settings.USER_ID_CLAIM] if raw_token else None
+        except (TokenError, KeyError):
+            return None
+    user = getattr(request, 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route safe requests to views marked ``read_replica = True`` to a random replica.
+
+    A user whose request wrote to the primary is pinned to it for
+    ``REPLICA_PIN_SECONDS``, so the replicas can catch up before it reads
+    from them again. Without configured replicas every request uses the
+    primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.replicas = replica_aliases()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _routing.set(state)
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            self._reset(token, response)
+        self._pin_after_write(request, state)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _routing.set(state)
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._reset(token, response)
+        await sync_to_async(self._pin_after_write)(request, state)
+        return response
+
+    @staticmethod
+    def _reset(token, response):
+        # A streaming response is read after the middleware returns; it keeps
+        # its routing until closed, see end_routing
+        if not getattr(response, 'streaming', False):
+            _routing.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.replicas or request.method not in ('GET', 'HEAD'):
+            return None
+        view = getattr(view_func, 'cls', view_func)
+        if not getattr(view, 'read_replica', False):
+            return None
+        user_id = _request_user_id(request)
+        if user_id is not None and cache.get(PIN_KEY.format(user_id=user_id)):
+            return None
+        _routing.get().read_alias = random.choice(self.replicas)
+        return None
+
+    def _pin_after_write(self, request, state):
+        if not state.wrote or not self.replicas:
+            return
+        # Authentication has run by now and set request.user
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cache.set(PIN_KEY.format(user_id=user.pk), True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
@@ -0,0 +1,138 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .access import get_accessible_property_ids, scope_queryset
+from .models import User, Property, Unit, TenantUnit, MaintenanceRequest
+
+MAX_RESULTS = 50
+# Words, plus the characters that keep e-mail addresses and phone numbers in one term
+_TERM = re.compile(r'\w(?:[\w@.+-]*\w)?')
+
+
+def _scope_maintenance(queryset, user):
+    if user.role == 'tenant':
+        return queryset.filter(tenant__user=user)
+    if user.role in ['landlord', 'property_manager', 'caretaker']:
+        return scope_queryset(queryset, user)
+    return queryset.none()
+
+
+def _scope_properties(queryset, user):
+    if user.role in ['landlord', 'property_manager']:
+        return scope_queryset(queryset, user, field='id')
+    return queryset.none()
+
+
+def _scope_units(queryset, user):
+    if user.role in ['landlord', 'property_manager']:
+        return scope_queryset(queryset, user)
+    if user.role == 'tenant':
+        return queryset.filter(id__in=TenantUnit.objects.filter(tenant__user=user).values('unit_id'))
+    return queryset.none()
+
+
+def _scope_tenants(queryset, user):
+    if user.role in ['landlord', 'property_manager']:
+        # A subquery rather than a join, so a tenant with several leases is returned once
+        leases = TenantUnit.objects.filter(unit__property_id__in=get_accessible_property_ids(user))
+        return queryset.filter(tenant_profile__in=leases.values('tenant_id'))
+    return queryset.none()
+
+
+class SearchTarget:
+    """A searchable model: its indexed columns, text search config, RBAC scope and result fields."""
+
+    def __init__(self, queryset, columns, config, scope, fields, renamed=None):
+        self.queryset = queryset
+        self.columns = columns
+        self.config = config
+        self.scope = scope
+        self.fields = fields
+        self.renamed = renamed or {}
+
+    def scoped(self, user):
+        queryset = self.queryset.all()
+        return queryset if user.role == 'admin' else self.scope(queryset, user)
+
+
+# Columns and configs match the index built by migration 0011_search_index
+SEARCH_TARGETS = {
+    'maintenance': SearchTarget(
+        MaintenanceRequest.objects.all(), ['description'], 'english', _scope_maintenance,
+        ['id', 'property_id', 'unit_id', 'status', 'description'],
+    ),
+    'properties': SearchTarget(
+        Property.objects.all(), ['name', 'address'], 'simple', _scope_properties,
+        ['id', 'name', 'address'],
+    ),
+    'units': SearchTarget(
+        Unit.objects.all(), ['unit_number'], 'simple', _scope_units,
+        ['id', 'property_id', 'unit_number', 'status'],
+    ),
+    'tenants': SearchTarget(
+        User.objects.filter(role='tenant', tenant_profile__isnull=False),
+        ['first_name', 'last_name', 'email', 'phone_number'], 'simple', _scope_tenants,
+        ['first_name', 'last_name', 'email', 'phone_number'],
+        renamed={'tenant_id': F('tenant_profile__id'), 'user_id': F('id')},
+    ),
+}
+
+
+def search_terms(text):
+    return _TERM.findall(text or '')
+
+
+def _postgresql_matches(queryset, target, terms):
+    # Every term is a prefix, so "leak b1" already finds "Leaking tap in B12"
+    query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=target.config)
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    document = RawSQL(f'{table}.search_vector', [], output_field=SearchVectorField())
+    return queryset.annotate(document=document).filter(document=query).annotate(rank=SearchRank(F('document'), query))
+
+
+def _sqlite_matches(queryset, target, terms):
+    table = queryset.model._meta.db_table
+    fts = f'{table}_fts'
+    match = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+    # bm25() is lower for better matches
+    rank = RawSQL(
+        f'SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND {fts}.rowid = "{table}"."id"',
+        [match], output_field=FloatField(),
+    )
+    matches = RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match])
+    return queryset.filter(id__in=matches).annotate(rank=rank)
+
+
+def _unindexed_matches(queryset, target, terms):
+    condition = reduce(and_, [
+        reduce(or_, [Q(**{f'{column}__icontains': term}) for column in target.columns]) for term in terms
+    ])
+    return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+def search(kind, text, user, limit=10):
+    """
+    Best-ranked rows of ``kind`` matching every term of ``text`` that ``user`` is allowed to see.
+
+    PostgreSQL matches prefix ``tsquery`` terms against the GIN-indexed
+    ``search_vector`` column and ranks with ``ts_rank``; SQLite queries the
+    FTS5 table and ranks with ``bm25``. Other databases get an unranked,
+    unindexed ``icontains`` scan. Returns a list of dicts with a ``rank`` key.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    target = SEARCH_TARGETS[kind]
+    matcher = {
+        'postgresql': _postgresql_matches,
+        'sqlite': _sqlite_matches,
+    }.get(connection.vendor, _unindexed_matches)
+    queryset = matcher(target.scoped(user), target, terms)
+    rows = queryset.order_by('-rank', 'id').values(*target.fields, 'rank', **target.renamed)
+    return list(rows[:min(limit, MAX_RESULTS)])
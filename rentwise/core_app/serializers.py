@@ -1,14 +1,18 @@
 from django.contrib.auth import authenticate
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from .access import has_property_access, scope_queryset
+from .fieldsets import Expandable, ExpandableFieldsMixin
 from .models import (
     User, Property, Unit, TenantProfile, CaretakerProfile,
-    Payment, MaintenanceRequest, ManagerProfile, TenantUnit
+    Payment, MaintenanceRequest, ManagerProfile, TenantUnit, PropertyLedger
 )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -28,7 +32,7 @@ class UserSerializer(serializers.ModelSerializer):
         user.save()
         return user
 
-class CurrentUserSerializer(serializers.ModelSerializer):
+class CurrentUserSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     tenant_profile = serializers.SerializerMethodField()
     manager_profile = serializers.SerializerMethodField()
     caretaker_profile = serializers.SerializerMethodField()
@@ -60,7 +64,7 @@ class CurrentUserSerializer(serializers.ModelSerializer):
 
 
 
-class UnitSerializer(serializers.ModelSerializer):
+class UnitSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     property_id = serializers.PrimaryKeyRelatedField(
         queryset=Property.objects.all(),
         source='property',
@@ -72,7 +76,7 @@ class UnitSerializer(serializers.ModelSerializer):
         fields = ['id', 'unit_number', 'size', 'rent', 'status', 'property_id']
 
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     owner = UserSerializer(read_only=True)
     owner_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), source='owner', write_only=True,required=False
@@ -86,9 +90,13 @@ class PropertySerializer(serializers.ModelSerializer):
             'owner', 'owner_id', 'units',
             'created_at', 'updated_at'
         ]
+        expandable = {
+            'owner': Expandable(UserSerializer),
+            'units': Expandable(UnitSerializer, many=True),
+        }
 
 
-class TenantProfileSerializer(serializers.ModelSerializer):
+class TenantProfileSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), source='user', write_only=True
@@ -104,9 +112,13 @@ class TenantProfileSerializer(serializers.ModelSerializer):
             'id', 'user', 'user_id', 'units', 'unit_ids',
             'move_in_date', 'move_out_date'
         ]
+        expandable = {
+            'user': Expandable(UserSerializer),
+            'units': Expandable(UnitSerializer, many=True),
+        }
 
 
-class ManagerProfileSerializer(serializers.ModelSerializer):
+class ManagerProfileSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), source='user', write_only=True
@@ -123,9 +135,13 @@ class ManagerProfileSerializer(serializers.ModelSerializer):
             'id', 'user', 'user_id',
             'managed_properties', 'managed_property_ids'
         ]
+        expandable = {
+            'user': Expandable(UserSerializer),
+            'managed_properties': Expandable(PropertySerializer, many=True),
+        }
 
 
-class CaretakerProfileSerializer(serializers.ModelSerializer):
+class CaretakerProfileSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), source='user', write_only=True
@@ -142,36 +158,105 @@ class CaretakerProfileSerializer(serializers.ModelSerializer):
             'id', 'user', 'user_id',
             'assigned_property', 'assigned_property_id'
         ]
+        expandable = {
+            'user': Expandable(UserSerializer),
+            'assigned_property': Expandable(PropertySerializer),
+        }
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class TenantUnitFieldMixin:
+    """
+    ``unit_id`` handling for rows owned by a tenant (payments, maintenance requests).
+
+    The row's property is derived from its unit, so the unit must be one the
+    requesting user can see (for tenants, one they currently lease) and one the
+    row's tenant leases. Without a unit the tenant's only current lease is used,
+    and the row is rejected when there is none or several.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if 'unit_id' in fields and user is not None and user.is_authenticated:
+            if user.role == 'tenant':
+                units = Unit.objects.filter(
+                    Q(tenantunit__move_out_date__isnull=True) | Q(tenantunit__move_out_date__gte=timezone.localdate()),
+                    tenantunit__tenant__user_id=user.id,
+                )
+            else:
+                units = scope_queryset(Unit.objects.all(), user)
+            fields['unit_id'].queryset = units
+        return fields
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if 'tenant' not in attrs and 'unit' not in attrs:
+            return attrs
+        tenant = attrs['tenant'] if 'tenant' in attrs else self.instance.tenant
+        unit = attrs['unit'] if 'unit' in attrs else getattr(self.instance, 'unit', None)
+        if unit is not None:
+            if not TenantUnit.objects.filter(tenant=tenant, unit=unit).exists():
+                raise serializers.ValidationError({'unit_id': 'The tenant does not lease this unit.'})
+            return attrs
+
+        unit_id, property_id = tenant.current_placement()
+        if unit_id is None:
+            raise serializers.ValidationError(
+                {'unit_id': 'This field is required: the tenant has no single current lease.'}
+            )
+        request = self.context.get('request')
+        if request is not None and not has_property_access(request.user, property_id):
+            raise serializers.ValidationError({'tenant_id': 'You do not have access to this tenant.'})
+        attrs.pop('unit', None)
+        attrs['unit_id'], attrs['property_id'] = unit_id, property_id
+        return attrs
+
+
+class PaymentSerializer(TenantUnitFieldMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     tenant = TenantProfileSerializer(read_only=True)
     tenant_id = serializers.PrimaryKeyRelatedField(
         queryset=TenantProfile.objects.all(), source='tenant', write_only=True
     )
+    unit_id = serializers.PrimaryKeyRelatedField(
+        queryset=Unit.objects.all(), source='unit', required=False, allow_null=True
+    )
+    property_id = serializers.PrimaryKeyRelatedField(source='property', read_only=True)
 
     class Meta:
         model = Payment
         fields = [
-            'id', 'tenant', 'tenant_id',
+            'id', 'tenant', 'tenant_id', 'unit_id', 'property_id',
             'amount', 'due_date', 'payment_date',
             'status', 'created_at', 'updated_at'
         ]
+        expandable = {'tenant': Expandable(TenantProfileSerializer)}
 
 
-class MaintenanceRequestSerializer(serializers.ModelSerializer):
+class MaintenanceRequestSerializer(TenantUnitFieldMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
     tenant = TenantProfileSerializer(read_only=True)
     tenant_id = serializers.PrimaryKeyRelatedField(
         queryset=TenantProfile.objects.all(), source='tenant', write_only=True
     )
+    unit_id = serializers.PrimaryKeyRelatedField(
+        queryset=Unit.objects.all(), source='unit', required=False, allow_null=True
+    )
+    property_id = serializers.PrimaryKeyRelatedField(source='property', read_only=True)
 
     class Meta:
         model = MaintenanceRequest
         fields = [
-            'id', 'tenant', 'tenant_id',
+            'id', 'tenant', 'tenant_id', 'unit_id', 'property_id',
             'description', 'request_date',
             'completion_date', 'status'
         ]
+        expandable = {'tenant': Expandable(TenantProfileSerializer)}
+
+
+class PropertyLedgerSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = PropertyLedger
+        fields = ['month', 'billed', 'collected', 'outstanding', 'overdue_count', 'updated_at']
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -217,4 +302,6 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["role"] = getattr(user, "role", None)
         token["first_name"] = user.first_name
         token["last_name"] = user.last_name
+        token["is_staff"] = user.is_staff
+        token["token_version"] = user.token_version
         return token
\ No newline at end of file
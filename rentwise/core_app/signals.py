@@ -0,0 +1,228 @@
+from django.core.signals import request_finished, request_started
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .access import invalidate_access_scope
+from .authentication import verified_tokens
+from .db_connections import record_connection, record_request
+from .leases import attribute_unplaced_rows
+from .ledger import add_contribution, apply_deltas, empty_deltas, payment_contribution
+from .models import (
+    User, Property, Unit, TenantProfile, CaretakerProfile, ManagerProfile, TenantUnit, Payment, MaintenanceRequest
+)
+from .response_cache import bump_property_versions
+from .routers import end_routing
+
+
+# ---------------------------
+# Property ledger
+# ---------------------------
+# Payment.save() and delete() run these receivers in the same transaction as the
+# row write, so the previous row is read under a lock and the ledger delta is
+# committed (or rolled back) together with the row.
+def _locked_contribution(pk):
+    previous = Payment.objects.select_for_update().filter(pk=pk).first()
+    return previous and payment_contribution(previous)
+
+
+@receiver(pre_save, sender=Payment)
+def remember_previous_payment(sender, instance, **kwargs):
+    instance._ledger_previous = None
+    if instance.pk is not None:
+        instance._ledger_previous = _locked_contribution(instance.pk)
+
+
+@receiver(post_save, sender=Payment)
+def update_ledger_on_save(sender, instance, **kwargs):
+    deltas = empty_deltas()
+    add_contribution(deltas, instance._ledger_previous, sign=-1)
+    add_contribution(deltas, payment_contribution(instance))
+    apply_deltas(deltas)
+
+
+@receiver(pre_delete, sender=Payment)
+def remember_deleted_payment(sender, instance, **kwargs):
+    # The stored row, which a concurrent update may have changed since the instance was loaded
+    instance._ledger_previous = _locked_contribution(instance.pk)
+
+
+@receiver(post_delete, sender=Payment)
+def update_ledger_on_delete(sender, instance, **kwargs):
+    deltas = empty_deltas()
+    add_contribution(deltas, getattr(instance, '_ledger_previous', None), sign=-1)
+    apply_deltas(deltas)
+
+
+# ---------------------------
+# Token versioning
+# ---------------------------
+TOKEN_VERSION_FIELDS = ['role', 'is_active', 'is_staff', 'password']
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_credentials(sender, instance, update_fields=None, **kwargs):
+    instance._previous_credentials = None
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(TOKEN_VERSION_FIELDS)):
+        return
+    if instance.get_deferred_fields() & set(TOKEN_VERSION_FIELDS):
+        return
+    instance._previous_credentials = User.objects.filter(pk=instance.pk).values(*TOKEN_VERSION_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def bump_token_version(sender, instance, **kwargs):
+    previous = instance._previous_credentials
+    if previous and any(previous[field] != getattr(instance, field) for field in TOKEN_VERSION_FIELDS):
+        User.objects.filter(pk=instance.pk).update(token_version=F('token_version') + 1)
+        # Otherwise the next save() of this instance writes the old version back
+        instance.refresh_from_db(fields=['token_version'])
+        verified_tokens.forget_user(instance.pk)
+
+
+# ---------------------------
+# Access scope invalidation
+# ---------------------------
+@receiver(post_save, sender=User)
+def invalidate_scope_on_user_change(sender, instance, **kwargs):
+    # The scope depends on the role, which may have changed
+    invalidate_access_scope(instance.id)
+
+
+@receiver(pre_save, sender=Property)
+def remember_previous_owner(sender, instance, **kwargs):
+    instance._previous_owner_id = None
+    if instance.pk is not None:
+        instance._previous_owner_id = Property.objects.filter(pk=instance.pk).values_list(
+            'owner_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Property)
+def invalidate_scope_on_property_save(sender, instance, created, **kwargs):
+    if created or instance._previous_owner_id != instance.owner_id:
+        invalidate_access_scope(instance.owner_id, instance._previous_owner_id)
+
+
+@receiver(pre_delete, sender=Property)
+def invalidate_scope_on_property_delete(sender, instance, **kwargs):
+    invalidate_access_scope(
+        instance.owner_id,
+        *instance.managers.values_list('user_id', flat=True),
+        *instance.caretakers.values_list('user_id', flat=True),
+        *TenantUnit.objects.filter(unit__property=instance).values_list('tenant__user_id', flat=True),
+    )
+
+
+@receiver(m2m_changed, sender=ManagerProfile.managed_properties.through)
+def invalidate_scope_on_manager_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ['post_add', 'post_remove', 'pre_clear']:
+        return
+    if not reverse:
+        invalidate_access_scope(instance.user_id)
+    elif action == 'pre_clear':
+        invalidate_access_scope(*instance.managers.values_list('user_id', flat=True))
+    else:
+        invalidate_access_scope(*ManagerProfile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=CaretakerProfile)
+@receiver(post_delete, sender=CaretakerProfile)
+def invalidate_scope_on_caretaker_assignment(sender, instance, **kwargs):
+    invalidate_access_scope(instance.user_id)
+
+
+@receiver(post_save, sender=TenantUnit)
+@receiver(post_delete, sender=TenantUnit)
+def invalidate_scope_on_lease_change(sender, instance, **kwargs):
+    invalidate_access_scope(
+        TenantProfile.objects.filter(pk=instance.tenant_id).values_list('user_id', flat=True).first()
+    )
+
+
+# ---------------------------
+# Per-property response cache versions
+# ---------------------------
+def _unit_property_id(unit_id):
+    return Unit.objects.filter(pk=unit_id).values_list('property_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Unit)
+@receiver(pre_save, sender=MaintenanceRequest)
+def remember_previous_property(sender, instance, **kwargs):
+    instance._previous_property_id = None
+    if instance.pk is not None:
+        instance._previous_property_id = sender.objects.filter(pk=instance.pk).values_list(
+            'property_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Unit)
+@receiver(post_save, sender=MaintenanceRequest)
+def bump_version_on_save(sender, instance, **kwargs):
+    bump_property_versions(instance.property_id, instance._previous_property_id)
+
+
+@receiver(post_save, sender=Payment)
+def bump_version_on_payment_save(sender, instance, **kwargs):
+    # The ledger handler already looked up the previous row
+    previous = instance._ledger_previous
+    bump_property_versions(instance.property_id, previous and previous[0][0])
+
+
+@receiver(post_delete, sender=Unit)
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=MaintenanceRequest)
+def bump_version_on_delete(sender, instance, **kwargs):
+    bump_property_versions(instance.property_id)
+
+
+@receiver(pre_save, sender=TenantUnit)
+def remember_previous_lease_property(sender, instance, **kwargs):
+    instance._previous_property_id = None
+    if instance.pk is not None:
+        instance._previous_property_id = TenantUnit.objects.filter(pk=instance.pk).values_list(
+            'unit__property_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=TenantUnit)
+@receiver(post_delete, sender=TenantUnit)
+def bump_version_on_lease_change(sender, instance, **kwargs):
+    # Tenant listings show each tenant's units, so every property the tenant rents in is affected
+    bump_property_versions(
+        _unit_property_id(instance.unit_id),
+        getattr(instance, '_previous_property_id', None),
+        *TenantUnit.objects.filter(tenant_id=instance.tenant_id).values_list('unit__property_id', flat=True),
+    )
+
+
+# ---------------------------
+# Rows recorded before a lease
+# ---------------------------
+@receiver(post_save, sender=TenantUnit)
+def attribute_rows_on_lease_create(sender, instance, created, **kwargs):
+    if created:
+        attribute_unplaced_rows([instance.tenant_id])
+
+
+# ---------------------------
+# Database connection churn
+# ---------------------------
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    record_connection(connection.alias)
+
+
+@receiver(request_started)
+def count_request(sender, **kwargs):
+    record_request()
+
+
+# ---------------------------
+# Read replica routing
+# ---------------------------
+@receiver(request_finished)
+def end_replica_routing(sender, **kwargs):
+    end_routing()
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from .billing import generate_invoices, mark_overdue_payments
+
+
+@shared_task
+def mark_overdue_payments_task():
+    return mark_overdue_payments()
+
+
+@shared_task
+def generate_invoices_task():
+    return generate_invoices()
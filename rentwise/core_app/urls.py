@@ -6,10 +6,14 @@ from .views import (
     CaretakerProfileViewSet, PaymentViewSet, MaintenanceRequestViewSet,
     CustomTokenObtainPairView, CurrentUserView,
     AssignManagerToPropertyView, AssignCaretakerToPropertyView, AssignUnitToTenantView,
+    BulkAssignUnitsToTenantsView, PaymentImportView,
     VacateUnitFromTenantView, UnassignCaretakerFromPropertyView, UnassignManagerFromPropertyView,
     TenantsByPropertyView, UnitsByPropertyView, PaymentsByPropertyView,
-    MaintenanceByPropertyView, PaymentsByTenantView
+    MaintenanceByPropertyView, PaymentsByTenantView, PropertyLedgerView, PropertyExportView,
+    ResponseCacheStatsView, PortfolioSummaryView, OccupancyAnalyticsView,
+    AgingReportView, SearchView, PropertyOverviewView, DatabaseConnectionStatsView,
 )
+from . import async_views
 
 # Register viewsets with DefaultRouter
 router = DefaultRouter()
@@ -29,6 +33,9 @@ urlpatterns = [
     path('auth/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
+    # Bulk payment import
+    path('import/payments/', PaymentImportView.as_view(), name='payment_import'),
+
     # Current user profile endpoint
     path('me/', CurrentUserView.as_view(), name='current_user'),
 
@@ -36,6 +43,7 @@ urlpatterns = [
     path('assign/manager/', AssignManagerToPropertyView.as_view(), name='assign_manager'),
     path('assign/caretaker/', AssignCaretakerToPropertyView.as_view(), name='assign_caretaker'),
     path('assign/unit/', AssignUnitToTenantView.as_view(), name='assign_unit'),
+    path('assign/units/bulk/', BulkAssignUnitsToTenantsView.as_view(), name='bulk_assign_units'),
 
     path('vacate/unit/', VacateUnitFromTenantView.as_view(), name='vacate_unit'),
     path('unassign/caretaker/', UnassignCaretakerFromPropertyView.as_view(), name='unassign_caretaker'),
@@ -46,7 +54,31 @@ urlpatterns = [
     path('properties/<int:property_id>/units/', UnitsByPropertyView.as_view(), name='units_by_property'),
     path('properties/<int:property_id>/payments/', PaymentsByPropertyView.as_view(), name='payments_by_property'),
     path('properties/<int:property_id>/maintenance/', MaintenanceByPropertyView.as_view(), name='maintenance_by_property'),
+    path('properties/<int:property_id>/overview/', PropertyOverviewView.as_view(), name='overview_by_property'),
+    path('properties/<int:property_id>/ledger/', PropertyLedgerView.as_view(), name='ledger_by_property'),
+    path('properties/<int:property_id>/export/<str:dataset>/', PropertyExportView.as_view(), name='export_by_property'),
+
+    # Portfolio overview
+    path('portfolio/summary/', PortfolioSummaryView.as_view(), name='portfolio_summary'),
+    path('analytics/occupancy/', OccupancyAnalyticsView.as_view(), name='occupancy_analytics'),
+    path('reports/aging/', AgingReportView.as_view(), name='aging_report'),
+
+    # Async variants: independent queries run concurrently (serve through rentwise.asgi)
+    path('async/me/', async_views.current_user, name='current_user_async'),
+    path(
+        'async/properties/<int:property_id>/overview/', async_views.property_overview,
+        name='overview_by_property_async',
+    ),
+
+    # Search
+    path('search/', SearchView.as_view(), name='search'),
 
     # Payments by tenant
     path('tenants/<int:tenant_id>/payments/', PaymentsByTenantView.as_view(), name='payments_by_tenant'),
+
+    # Response cache counters
+    path('cache/stats/', ResponseCacheStatsView.as_view(), name='response_cache_stats'),
+
+    # Database connection pool / churn counters
+    path('db/connections/', DatabaseConnectionStatsView.as_view(), name='db_connection_stats'),
 ]
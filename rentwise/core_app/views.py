@@ -1,24 +1,57 @@
+from datetime import date
+
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, permissions, status
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
 
 from .models import (
     User, Property, Unit, TenantProfile,
-    CaretakerProfile, Payment, MaintenanceRequest, ManagerProfile, TenantUnit
+    CaretakerProfile, Payment, MaintenanceRequest, ManagerProfile, TenantUnit, PropertyLedger
 )
 from .serializers import (
     UserSerializer, PropertySerializer, UnitSerializer,
     TenantProfileSerializer, CaretakerProfileSerializer,
-    PaymentSerializer, MaintenanceRequestSerializer, CustomTokenObtainPairSerializer
+    PaymentSerializer, MaintenanceRequestSerializer, CustomTokenObtainPairSerializer,
+    PropertyLedgerSerializer
 )
 from .permissions import IsLandlordOrManager, IsLandlordOrAdmin
+from .pagination import KeysetPagination, PaymentPagination, MaintenanceRequestPagination
+from .access import get_accessible_property_ids, has_property_access, scope_queryset
+from .leases import assign_units_bulk
+from .ledger import ZERO
+from .importers import STATEMENT_FORMATS, PaymentImporter, StatementError, read_statement
+from .exports import CHUNK_SIZE, DATASETS, EXPORT_FORMATS, stream_export, stream_rows
+from .fieldsets import ExpandableQuerysetMixin, apply_query_plan
+from .fastpath import ValuesListMixin, serialize_page
+from .conditional import ConditionalGetMixin, conditional_response
+from .response_cache import cache_stats, cached_property_response
+from .portfolio import portfolio_summary
+from .occupancy import GRANULARITIES, MAX_PERIODS, occupancy_report, period_starts
+from .aging import AGING_GROUPS, aging_report, aging_totals
+from .search import MAX_RESULTS, SEARCH_TARGETS, search
+from .filters import PaymentFilter, MaintenanceRequestFilter, UnitFilter, TenantUnitFilter, apply_filters
+from .overview import current_user_data, current_user_parts, property_overview_parts
+from .db_connections import connection_report
+
+
+def query_date(request, name, default=None):
+    """Return the ``name`` query parameter as a date, ``default`` when absent; ValueError if it is not YYYY-MM-DD."""
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"{name} is not a YYYY-MM-DD date")
+    return parsed
 
 
 # ---------------------------
 # User ViewSet (Admin Only)
 # ---------------------------
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
@@ -32,47 +65,32 @@ class CurrentUserView(APIView):
 
     @staticmethod
     def get(request):
-        user = request.user
-        data = UserSerializer(user).data
-
-        # Include the profile matching the user's role
-        if user.role == 'tenant':
-            profile = getattr(user, 'tenant_profile', None)
-            if profile:
-                data['tenant_profile'] = TenantProfileSerializer(profile).data
-        elif user.role == 'caretaker':
-            profile = getattr(user, 'caretaker_profile', None)
-            if profile:
-                data['caretaker_profile'] = CaretakerProfileSerializer(profile).data
-        elif user.role == 'property_manager':
-            profile = getattr(user, 'manager_profile', None)
-            if profile:
-                data['manager_profile'] = {
-                    'managed_properties': [p.id for p in profile.managed_properties.all()]
-                }
-        # Landlord and admin roles could also include properties
-        elif user.role == 'landlord':
-            data['properties'] = [p.id for p in user.properties.all()]
-        return Response(data)
+        parts = current_user_parts(request.user)
+        return Response(current_user_data({key: part() for key, part in parts.items()}))
 
 
 # ---------------------------
 # Property ViewSet
 # ---------------------------
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(ConditionalGetMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
     permission_classes = [permissions.IsAuthenticated, IsLandlordOrAdmin]
 
+    def get_validator_querysets(self, queryset):
+        # Each property lists its unit ids, so unit changes must change the ETag too
+        return [queryset, Unit.objects.filter(property_id__in=queryset.values('id'))]
+
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if not user.is_authenticated:
-            return Property.objects.none()
+            return queryset.none()
         if user.role == 'admin':
-            return Property.objects.all()
+            return queryset
         elif user.role in ['landlord', 'property_manager']:
-            return Property.objects.filter(owner=user)
-        return Property.objects.none()
+            return scope_queryset(queryset, user, field='id')
+        return queryset.none()
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -81,10 +99,11 @@ class PropertyViewSet(viewsets.ModelViewSet):
 # ---------------------------
 # Unit ViewSet
 # ---------------------------
-class UnitViewSet(viewsets.ModelViewSet):
+class UnitViewSet(ConditionalGetMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = Unit.objects.all()
     serializer_class = UnitSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filterset_class = UnitFilter
 
     def get_queryset(self):
         user = self.request.user
@@ -94,10 +113,7 @@ class UnitViewSet(viewsets.ModelViewSet):
         if role == 'admin':
             return Unit.objects.all()
         elif role in ['landlord', 'property_manager']:
-            if role == 'landlord':
-                return Unit.objects.filter(property__owner=user)
-            else:  # manager
-                return Unit.objects.filter(property__in=user.manager_profile.managed_properties.all())
+            return scope_queryset(Unit.objects.all(), user)
 
         elif role == 'tenant':
             tenant_profile = getattr(user, 'tenant_profile', None)
@@ -109,87 +125,131 @@ class UnitViewSet(viewsets.ModelViewSet):
 # ---------------------------
 # TenantProfile ViewSet
 # ---------------------------
-class TenantProfileViewSet(viewsets.ModelViewSet):
+class TenantProfileViewSet(ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = TenantProfile.objects.all()
     serializer_class = TenantProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if not user.is_authenticated:
-            return TenantProfile.objects.none()
+            return queryset.none()
         role = user.role
         if role == 'admin':
-            return TenantProfile.objects.all()
+            return queryset
         elif role == 'tenant':
-            return TenantProfile.objects.filter(user=user)
+            return queryset.filter(user=user)
         elif role in ['landlord', 'property_manager']:
-            return TenantProfile.objects.filter(units__property__owner=user).distinct()
-        return TenantProfile.objects.none()
+            leases = scope_queryset(TenantUnit.objects.all(), user, field='unit__property_id')
+            return queryset.filter(id__in=leases.values('tenant_id'))
+        return queryset.none()
 
 
 # ---------------------------
 # CaretakerProfile ViewSet
 # ---------------------------
-class CaretakerProfileViewSet(viewsets.ModelViewSet):
+class CaretakerProfileViewSet(ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = CaretakerProfile.objects.all()
     serializer_class = CaretakerProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if not user.is_authenticated:
-            return CaretakerProfile.objects.none()
+            return queryset.none()
         role = user.role
         if role == 'admin':
-            return CaretakerProfile.objects.all()
+            return queryset
         elif role in ['caretaker', 'property_manager', 'landlord']:
-            return CaretakerProfile.objects.all()
-        return CaretakerProfile.objects.none()
+            return queryset
+        return queryset.none()
 
 
 # ---------------------------
 # Payment ViewSet
 # ---------------------------
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ConditionalGetMixin, ValuesListMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+    pagination_class = PaymentPagination
+    filterset_class = PaymentFilter
 
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if not user.is_authenticated:
-            return Payment.objects.none()
+            return queryset.none()
         role = user.role
         if role == 'admin':
-            return Payment.objects.all()
+            return queryset
         elif role == 'tenant':
-            return Payment.objects.filter(tenant__user=user)
+            return queryset.filter(tenant__user=user)
         elif role in ['landlord', 'property_manager']:
-            return Payment.objects.filter(tenant__units__property__owner=user).distinct()
-        return Payment.objects.none()
+            return scope_queryset(queryset, user)
+        return queryset.none()
 
 
 # ---------------------------
 # MaintenanceRequest ViewSet
 # ---------------------------
-class MaintenanceRequestViewSet(viewsets.ModelViewSet):
+class MaintenanceRequestViewSet(ValuesListMixin, ExpandableQuerysetMixin, viewsets.ModelViewSet):
     queryset = MaintenanceRequest.objects.all()
     serializer_class = MaintenanceRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+    pagination_class = MaintenanceRequestPagination
+    filterset_class = MaintenanceRequestFilter
 
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if not user.is_authenticated:
-            return MaintenanceRequest.objects.none()
+            return queryset.none()
         role = user.role
         if role == 'admin':
-            return MaintenanceRequest.objects.all()
+            return queryset
         elif role == 'tenant':
-            return MaintenanceRequest.objects.filter(tenant__user=user)
+            return queryset.filter(tenant__user=user)
         elif role in ['landlord', 'property_manager', 'caretaker']:
-            return MaintenanceRequest.objects.filter(tenant__units__property__owner=user).distinct()
-        return MaintenanceRequest.objects.none()
+            return scope_queryset(queryset, user)
+        return queryset.none()
+
+
+# ---------------------------
+# Payment Statement Import
+# ---------------------------
+class PaymentImportView(APIView):
+    """Import a bank / mobile-money statement (multipart ``file``, CSV or JSON lines) as paid payments."""
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @staticmethod
+    def post(request):
+        user = request.user
+        if user.role not in ['admin', 'landlord', 'property_manager']:
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        statement = request.FILES.get('file')
+        if statement is None:
+            return Response({"detail": "Upload the statement as 'file'"}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = request.data.get('file_format') or statement.name.rsplit('.', 1)[-1].lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in STATEMENT_FORMATS:
+            return Response({"detail": f"file_format must be one of {', '.join(STATEMENT_FORMATS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        importer = PaymentImporter(user=user)
+        try:
+            importer.run(read_statement(statement, file_format))
+        except StatementError as exc:
+            # Earlier batches are already committed; 'accepted' says how many rows that was
+            return Response({"detail": str(exc), **importer.summary}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(importer.summary)
 
 
 # ---------------------------
@@ -284,13 +344,9 @@ class AssignUnitToTenantView(APIView):
         except Unit.DoesNotExist:
             return Response({"detail": "Unit not found"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Optional: Only allow assignment if user has access to the property
-        if user.role == 'property_manager':
-            if not unit.property in user.manager_profile.managed_properties.all():
-                return Response({"detail": "Manager does not manage this property"}, status=status.HTTP_403_FORBIDDEN)
-        elif user.role == 'caretaker':
-            if unit.property != user.caretaker_profile.assigned_property:
-                return Response({"detail": "Caretaker does not manage this property"}, status=status.HTTP_403_FORBIDDEN)
+        # Only allow assignment if user has access to the property
+        if not has_property_access(user, unit.property_id):
+            return Response({"detail": "You do not manage this property"}, status=status.HTTP_403_FORBIDDEN)
 
         tenant_profile, _ = TenantProfile.objects.get_or_create(user=tenant_user)
         TenantUnit.objects.create(
@@ -302,6 +358,28 @@ class AssignUnitToTenantView(APIView):
         return Response({"detail": f"Unit {unit.unit_number} assigned to {tenant_user.username}"})
 
 
+class BulkAssignUnitsToTenantsView(APIView):
+    """Batch variant of AssignUnitToTenantView: POST {"assignments": [{tenant_id, unit_id, ...}, ...]}."""
+    permission_classes = [permissions.IsAuthenticated]
+    max_rows = 10000
+
+    def post(self, request):
+        user = request.user
+        if user.role not in ['landlord', 'property_manager', 'caretaker']:
+            return Response({"detail": "Only landlords, managers, or caretakers can assign units"},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        rows = request.data.get('assignments')
+        if not isinstance(rows, list):
+            return Response({"detail": "'assignments' must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > self.max_rows:
+            return Response({"detail": f"At most {self.max_rows} assignments per request"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        created, errors = assign_units_bulk(user, rows)
+        return Response({"created": created, "errors": errors})
+
+
 
 # ---------------------------
 # Vacate / Unassign Endpoints
@@ -364,22 +442,62 @@ class UnassignManagerFromPropertyView(APIView):
         except (ManagerProfile.DoesNotExist, Property.DoesNotExist):
             return Response({"detail": "Manager or property not found"}, status=status.HTTP_400_BAD_REQUEST)
 
+# ---------------------------
+# Payment summaries
+# ---------------------------
+def payments_summary_response(request, payments, paginator, view=None):
+    """
+    Build the payments summary shared by the per-property and per-tenant views.
+
+    Totals are computed in the database; pass ``?totals_only=true`` to skip
+    the payment list entirely.
+    """
+    totals = payments.totals()
+    data = {
+        "total_due": totals['total_due'],
+        "total_collected": totals['total_collected'],
+        "status_counts": {
+            "paid": totals['paid_count'],
+            "pending": totals['pending_count'],
+            "overdue": totals['overdue_count'],
+        },
+    }
+    if request.query_params.get('totals_only', '').lower() in ['1', 'true', 'yes']:
+        return Response(data)
+
+    page = paginator.paginate_queryset(
+        apply_query_plan(payments, PaymentSerializer, request), request, view=view
+    )
+    data.update({
+        "payments": PaymentSerializer(page, many=True, context={'request': request}).data,
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+    })
+    return Response(data)
+
+
 # ---------------------------
 # Tenants by Property
 # ---------------------------
 class TenantsByPropertyView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
-    @staticmethod
-    def get(request, property_id):
+    def get(self, request, property_id):
         user = request.user
         # RBAC: only landlords/managers for their properties
-        if user.role not in ['landlord', 'property_manager']:
+        if user.role not in ['landlord', 'property_manager'] or not has_property_access(user, property_id):
             return Response({"detail": "Forbidden"}, status=403)
 
-        tenants = TenantProfile.objects.filter(units__property__id=property_id).distinct()
-        serializer = TenantProfileSerializer(tenants, many=True)
-        return Response(serializer.data)
+        # ?active_on= / ?unit= narrow the leases the tenants are picked from
+        leases = apply_filters(TenantUnitFilter, TenantUnit.objects.filter(unit__property_id=property_id), request)
+        tenants = apply_query_plan(
+            TenantProfile.objects.filter(id__in=leases.values('tenant_id')), TenantProfileSerializer, request,
+        )
+        return cached_property_response(
+            request, 'tenants', property_id,
+            lambda: serialize_page(tenants, TenantProfileSerializer, request, self.pagination_class(), view=self),
+        )
 
 
 # ---------------------------
@@ -387,16 +505,22 @@ class TenantsByPropertyView(APIView):
 # ---------------------------
 class UnitsByPropertyView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
-    @staticmethod
-    def get(request, property_id):
+    def get(self, request, property_id):
         user = request.user
-        if user.role not in ['landlord', 'property_manager']:
+        if user.role not in ['landlord', 'property_manager'] or not has_property_access(user, property_id):
             return Response({"detail": "Forbidden"}, status=403)
 
-        units = Unit.objects.filter(property__id=property_id)
-        serializer = UnitSerializer(units, many=True)
-        return Response(serializer.data)
+        units = apply_filters(UnitFilter, Unit.objects.filter(property__id=property_id), request)
+        return conditional_response(
+            request, [units],
+            lambda: cached_property_response(
+                request, 'units', property_id,
+                lambda: serialize_page(units, UnitSerializer, request, self.pagination_class(), view=self),
+            ),
+            property_id=property_id,
+        )
 
 
 # ---------------------------
@@ -404,22 +528,63 @@ class UnitsByPropertyView(APIView):
 # ---------------------------
 class PaymentsByPropertyView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+    pagination_class = PaymentPagination
+
+    def get(self, request, property_id):
+        user = request.user
+        if user.role not in ['landlord', 'property_manager'] or not has_property_access(user, property_id):
+            return Response({"detail": "Forbidden"}, status=403)
+
+        payments = apply_filters(PaymentFilter, Payment.objects.filter(property_id=property_id), request)
+        return conditional_response(
+            request, [payments],
+            lambda: cached_property_response(
+                request, 'payments', property_id,
+                lambda: payments_summary_response(request, payments, self.pagination_class(), view=self),
+            ),
+            property_id=property_id,
+        )
+
+
+# ---------------------------
+# Property Overview
+# ---------------------------
+class PropertyOverviewView(APIView):
+    """
+    Units, tenants, payment totals and open maintenance of a property in one response.
+    ``core_app.async_views.property_overview`` serves the same data with the queries run concurrently.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
     @staticmethod
     def get(request, property_id):
         user = request.user
-        if user.role not in ['landlord', 'property_manager']:
+        if user.role not in ['landlord', 'property_manager'] or not has_property_access(user, property_id):
             return Response({"detail": "Forbidden"}, status=403)
 
-        payments = Payment.objects.filter(tenant__units__property__id=property_id)
-        serializer = PaymentSerializer(payments, many=True)
-        total_due = sum(p.amount for p in payments if p.status != 'paid')
-        total_collected = sum(p.amount for p in payments if p.status == 'paid')
-        return Response({
-            "payments": serializer.data,
-            "total_due": total_due,
-            "total_collected": total_collected
-        })
+        parts = property_overview_parts(property_id, request)
+        return Response({key: part() for key, part in parts.items()})
+
+
+# ---------------------------
+# Monthly Ledger by Property
+# ---------------------------
+class PropertyLedgerView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    @staticmethod
+    def get(request, property_id):
+        user = request.user
+        if user.role not in ['landlord', 'property_manager'] or not has_property_access(user, property_id):
+            return Response({"detail": "Forbidden"}, status=403)
+
+        ledger = PropertyLedger.objects.filter(property_id=property_id).order_by('-month')
+        return conditional_response(
+            request, [ledger],
+            lambda: Response(PropertyLedgerSerializer(ledger, many=True, context={'request': request}).data),
+        )
 
 
 # ---------------------------
@@ -427,16 +592,224 @@ class PaymentsByPropertyView(APIView):
 # ---------------------------
 class MaintenanceByPropertyView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+    pagination_class = MaintenanceRequestPagination
+
+    def get(self, request, property_id):
+        user = request.user
+        if user.role not in ['landlord', 'property_manager', 'caretaker'] or not has_property_access(user, property_id):
+            return Response({"detail": "Forbidden"}, status=403)
+
+        maintenance_requests = apply_filters(
+            MaintenanceRequestFilter, MaintenanceRequest.objects.filter(property_id=property_id), request
+        )
+        maintenance_requests = apply_query_plan(maintenance_requests, MaintenanceRequestSerializer, request)
+        return cached_property_response(
+            request, 'maintenance', property_id,
+            lambda: serialize_page(
+                maintenance_requests, MaintenanceRequestSerializer, request, self.pagination_class(), view=self,
+            ),
+        )
+
+
+# ---------------------------
+# Portfolio Summary
+# ---------------------------
+class PortfolioSummaryView(APIView):
+    """Unit, occupancy, arrears and maintenance figures for every property the caller can see."""
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
 
     @staticmethod
-    def get(request, property_id):
+    def get(request):
         user = request.user
-        if user.role not in ['landlord', 'property_manager', 'caretaker']:
+        if user.role not in ['admin', 'landlord', 'property_manager']:
             return Response({"detail": "Forbidden"}, status=403)
 
-        maintenance_requests = MaintenanceRequest.objects.filter(tenant__units__property__id=property_id)
-        serializer = MaintenanceRequestSerializer(maintenance_requests, many=True)
-        return Response(serializer.data)
+        properties = portfolio_summary(get_accessible_property_ids(user))
+        return Response({
+            "totals": {
+                "properties": len(properties),
+                "unit_count": sum(row['unit_count'] for row in properties),
+                "occupied_units": sum(row['occupied_units'] for row in properties),
+                "outstanding_balance": sum((row['outstanding_balance'] for row in properties), ZERO),
+                "overdue_count": sum(row['overdue_count'] for row in properties),
+                "open_maintenance_count": sum(row['open_maintenance_count'] for row in properties),
+            },
+            "properties": properties,
+        })
+
+
+# ---------------------------
+# Occupancy Analytics
+# ---------------------------
+class OccupancyAnalyticsView(APIView):
+    """Occupancy, vacancy days, turnover and lease length per property (``?start=&end=&granularity=&property_id=``)."""
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    @staticmethod
+    def get(request):
+        user = request.user
+        if user.role not in ['admin', 'landlord', 'property_manager']:
+            return Response({"detail": "Forbidden"}, status=403)
+
+        granularity = request.query_params.get('granularity', 'month')
+        if granularity not in GRANULARITIES:
+            return Response({"detail": f"granularity must be one of {', '.join(GRANULARITIES)}"}, status=400)
+        try:
+            end = query_date(request, 'end') or date.today()
+            start = query_date(request, 'start') or end.replace(year=end.year - 1, day=1)
+        except ValueError:
+            return Response({"detail": "start and end must be YYYY-MM-DD dates"}, status=400)
+        if start > end:
+            return Response({"detail": "start must not be after end"}, status=400)
+        if len(period_starts(start, end, granularity)) > MAX_PERIODS:
+            return Response({"detail": f"At most {MAX_PERIODS} periods per request; use a shorter range"}, status=400)
+
+        property_ids = get_accessible_property_ids(user)
+        property_id = request.query_params.get('property_id')
+        if property_id:
+            if not property_id.isdigit() or not has_property_access(user, property_id):
+                return Response({"detail": "Forbidden"}, status=403)
+            property_ids = [int(property_id)]
+        return Response(occupancy_report(property_ids, start, end, granularity))
+
+
+# ---------------------------
+# Arrears Aging Report
+# ---------------------------
+class AgingReportView(APIView):
+    """Unpaid amounts by days past due, per tenant or property (``?group_by=&as_of=&property_id=&file_format=``)."""
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    def perform_content_negotiation(self, request, force=False):
+        # A file_format download is CSV / NDJSON whatever the Accept header says
+        return super().perform_content_negotiation(request, force=force or 'file_format' in request.query_params)
+
+    @staticmethod
+    def get(request):
+        user = request.user
+        if user.role not in ['admin', 'landlord', 'property_manager']:
+            return Response({"detail": "Forbidden"}, status=403)
+
+        group_by = request.query_params.get('group_by', 'tenant')
+        if group_by not in AGING_GROUPS:
+            return Response({"detail": f"group_by must be one of {', '.join(AGING_GROUPS)}"}, status=400)
+        file_format = request.query_params.get('file_format')
+        if file_format is not None and file_format not in EXPORT_FORMATS:
+            return Response({"detail": f"file_format must be one of {', '.join(EXPORT_FORMATS)}"}, status=400)
+        try:
+            as_of = query_date(request, 'as_of') or date.today()
+        except ValueError:
+            return Response({"detail": "as_of must be a YYYY-MM-DD date"}, status=400)
+
+        payments = scope_queryset(Payment.objects.all(), user)
+        property_id = request.query_params.get('property_id')
+        if property_id:
+            if not property_id.isdigit() or not has_property_access(user, property_id):
+                return Response({"detail": "Forbidden"}, status=403)
+            payments = payments.filter(property_id=property_id)
+
+        rows, fields = aging_report(payments, group_by, as_of)
+        if file_format is not None:
+            return stream_rows(
+                rows.values_list(*fields).iterator(chunk_size=CHUNK_SIZE), fields, file_format,
+                f"aging-{group_by}-{as_of.isoformat()}",
+            )
+        return Response({
+            "as_of": as_of,
+            "group_by": group_by,
+            "totals": aging_totals(payments, as_of),
+            "rows": list(rows),
+        })
+
+
+# ---------------------------
+# Search
+# ---------------------------
+class SearchView(APIView):
+    """Ranked full-text search over maintenance requests, properties, units and tenants (``?q=&type=&limit=``)."""
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    @staticmethod
+    def get(request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({"detail": "q is required"}, status=400)
+        kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind] or list(SEARCH_TARGETS)
+        unknown = [kind for kind in kinds if kind not in SEARCH_TARGETS]
+        if unknown:
+            return Response({"detail": f"type must be one of {', '.join(SEARCH_TARGETS)}"}, status=400)
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=400)
+        if not 1 <= limit <= MAX_RESULTS:
+            return Response({"detail": f"limit must be between 1 and {MAX_RESULTS}"}, status=400)
+
+        return Response({
+            "query": text,
+            "results": {kind: search(kind, text, request.user, limit) for kind in kinds},
+        })
+
+
+# ---------------------------
+# Response Cache Statistics
+# ---------------------------
+class ResponseCacheStatsView(APIView):
+    """Hit / miss counters of the per-property response cache."""
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return Response(cache_stats())
+
+
+# ---------------------------
+# Database Connection Statistics
+# ---------------------------
+class DatabaseConnectionStatsView(APIView):
+    """Connection mode, pool utilization and connection churn of the answering process."""
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return Response(connection_report())
+
+
+# ---------------------------
+# Streaming Exports by Property
+# ---------------------------
+class PropertyExportView(APIView):
+    """Stream payments, maintenance or leases of a property as CSV / NDJSON (``?file_format=&start=&end=``)."""
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is CSV / NDJSON whatever the Accept header says
+        return super().perform_content_negotiation(request, force=True)
+
+    @staticmethod
+    def get(request, property_id, dataset):
+        user = request.user
+        if user.role not in ['landlord', 'property_manager'] or not has_property_access(user, property_id):
+            return Response({"detail": "Forbidden"}, status=403)
+        if dataset not in DATASETS:
+            return Response({"detail": f"dataset must be one of {', '.join(DATASETS)}"}, status=404)
+
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return Response({"detail": f"file_format must be one of {', '.join(EXPORT_FORMATS)}"}, status=400)
+        try:
+            start, end = query_date(request, 'start'), query_date(request, 'end')
+        except ValueError:
+            return Response({"detail": "start and end must be YYYY-MM-DD dates"}, status=400)
+
+        queryset, fields = DATASETS[dataset](property_id, start, end)
+        return stream_export(queryset, fields, file_format, f"property-{property_id}-{dataset}")
 
 
 # ---------------------------
@@ -444,19 +817,19 @@ class MaintenanceByPropertyView(APIView):
 # ---------------------------
 class PaymentsByTenantView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+    pagination_class = PaymentPagination
 
-    @staticmethod
-    def get(request, tenant_id):
+    def get(self, request, tenant_id):
         user = request.user
         # tenants can see their own payments
         if user.role == 'tenant' and user.id != tenant_id:
             return Response({"detail": "Forbidden"}, status=403)
         payments = Payment.objects.filter(tenant__user__id=tenant_id)
-        serializer = PaymentSerializer(payments, many=True)
-        total_due = sum(p.amount for p in payments if p.status != 'paid')
-        total_collected = sum(p.amount for p in payments if p.status == 'paid')
-        return Response({
-            "payments": serializer.data,
-            "total_due": total_due,
-            "total_collected": total_collected
-        })
\ No newline at end of file
+        if user.role != 'tenant':
+            payments = scope_queryset(payments, user)
+        payments = apply_filters(PaymentFilter, payments, request)
+        return conditional_response(
+            request, [payments],
+            lambda: payments_summary_response(request, payments, self.pagination_class(), view=self),
+        )
@@ -0,0 +1,21 @@
+"""
+Celery application for rentwise.
+
+Start a worker and the periodic scheduler with::
+
+    celery -A rentwise worker --beat -l info
+
+With ``CELERY_TASK_ALWAYS_EAGER`` (the default) tasks run in-process instead,
+which suits tests and single-node installs; schedule the matching management
+commands with cron there.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rentwise.settings')
+
+app = Celery('rentwise')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -11,8 +11,11 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 from datetime import timedelta
 from pathlib import Path
+import importlib.util
 import os
 import environ
+from celery.schedules import crontab
+from django.core.exceptions import ImproperlyConfigured
 
 # Initialize environment variables
 env = environ.Env(DEBUG=(bool, False))
@@ -42,14 +45,24 @@ AUTH_USER_MODEL = 'core_app.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core_app.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_FILTER_BACKENDS': ('django_filters.rest_framework.DjangoFilterBackend',),
+    'DEFAULT_PAGINATION_CLASS': 'core_app.pagination.KeysetPagination',
+    'PAGE_SIZE': env.int('PAGINATION_PAGE_SIZE', default=50),
 }
 
+# Upper bound for the ?page_size= query parameter on paginated endpoints
+PAGINATION_MAX_PAGE_SIZE = env.int('PAGINATION_MAX_PAGE_SIZE', default=500)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -57,6 +70,11 @@ SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": True,
 }
 
+# StatelessJWTAuthentication: how long (seconds) and how many verified (user, token version)
+# pairs each process remembers before re-checking the database
+JWT_USER_CACHE_TTL = env.int('JWT_USER_CACHE_TTL', default=30)
+JWT_USER_CACHE_SIZE = env.int('JWT_USER_CACHE_SIZE', default=10000)
+
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
 ]
@@ -72,11 +90,13 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'drf_spectacular',
     'rest_framework',
+    'django_filters',
     'core_app',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core_app.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -103,20 +123,110 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'rentwise.wsgi.application'
+ASGI_APPLICATION = 'rentwise.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': env('DB_NAME'),
-        'USER': env('DB_USER'),
-        'PASSWORD': env('DB_PASSWORD'),
-        'HOST': env('DB_HOST', default='localhost'),
-        'PORT': env('DB_PORT', default='5432'),
+# DATABASE_URL (e.g. sqlite:////tmp/primary.sqlite3) replaces the DB_* variables
+if env('DATABASE_URL', default=None):
+    DATABASES = {'default': env.db('DATABASE_URL')}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env('DB_NAME'),
+            'USER': env('DB_USER'),
+            'PASSWORD': env('DB_PASSWORD'),
+            'HOST': env('DB_HOST', default='localhost'),
+            'PORT': env('DB_PORT', default='5432'),
+        }
+    }
+# Check a reused connection before handing it to a request
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+
+# Connections are kept open for DB_CONN_MAX_AGE seconds and reused by later requests (0 closes
+# them after every request). DB_POOL=true uses psycopg's connection pool instead, which needs
+# PostgreSQL with psycopg 3 and psycopg_pool (pip install "psycopg[binary,pool]"); the pool replaces
+# persistent connections.
+DB_POOL = env.bool('DB_POOL', default=False)
+if DB_POOL:
+    if DATABASES['default']['ENGINE'] != 'django.db.backends.postgresql':
+        raise ImproperlyConfigured("DB_POOL=true needs a PostgreSQL database")
+    missing = [name for name in ('psycopg', 'psycopg_pool') if importlib.util.find_spec(name) is None]
+    if missing:
+        raise ImproperlyConfigured(
+            f"DB_POOL=true needs {' and '.join(missing)}: pip install \"psycopg[binary,pool]\""
+        )
+    from psycopg_pool import ConnectionPool
+
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+        'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+        # Seconds a request waits for a free connection before failing
+        'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+        'max_idle': env.float('DB_POOL_MAX_IDLE', default=300),
+        'check': ConnectionPool.check_connection,
     }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+
+# Read replicas, one database URL each (DB_REPLICA_URLS=postgres://...,postgres://...). Only views
+# marked read_replica = True read from them, see core_app.routers.
+for index, url in enumerate(env.list('DB_REPLICA_URLS', default=[]), start=1):
+    replica = env.db_url_config(url)
+    replica.update(
+        CONN_MAX_AGE=DATABASES['default']['CONN_MAX_AGE'],
+        CONN_HEALTH_CHECKS=DATABASES['default']['CONN_HEALTH_CHECKS'],
+        # Tests see the primary's data through the replica alias
+        TEST={'MIRROR': 'default'},
+    )
+    if replica['ENGINE'] == DATABASES['default']['ENGINE'] and 'pool' in DATABASES['default'].get('OPTIONS', {}):
+        replica.setdefault('OPTIONS', {})['pool'] = DATABASES['default']['OPTIONS']['pool']
+    DATABASES[f'replica_{index}'] = replica
+
+DATABASE_ROUTERS = ['core_app.routers.PrimaryReplicaRouter']
+# Seconds a client's reads stay on the primary after one of its requests wrote, to cover replication lag
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+
+# Worker threads the async views (core_app.async_views) run their concurrent queries on;
+# each keeps its own database connection
+ASYNC_QUERY_WORKERS = env.int('ASYNC_QUERY_WORKERS', default=32)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+# Cached per-property API responses can live in their own store (e.g. a shared Redis)
+if env('RESPONSE_CACHE_URL', default=None):
+    CACHES['responses'] = env.cache('RESPONSE_CACHE_URL')
+RESPONSE_CACHE_ALIAS = 'responses' if 'responses' in CACHES else 'default'
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300)
+
+# Seconds a user's accessible-property set stays cached (invalidated on assignment changes)
+ACCESS_SCOPE_CACHE_TIMEOUT = env.int('ACCESS_SCOPE_CACHE_TIMEOUT', default=300)
+
+
+# Celery
+# Tasks go to the broker; only DEBUG runs them in-process by default (CELERY_TASK_ALWAYS_EAGER)
+
+CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='memory://')
+CELERY_TASK_ALWAYS_EAGER = env.bool('CELERY_TASK_ALWAYS_EAGER', default=DEBUG)
+CELERY_TIMEZONE = 'UTC'
+CELERY_BEAT_SCHEDULE = {
+    'mark-overdue-payments': {
+        'task': 'core_app.tasks.mark_overdue_payments_task',
+        'schedule': crontab(minute=15),
+    },
+    'generate-invoices': {
+        'task': 'core_app.tasks.generate_invoices_task',
+        'schedule': crontab(minute=0, hour=1, day_of_month=1),
+    },
 }
 
 